@@ -0,0 +1,48 @@
+'''
+Orders per second through the abstract factory: `place_order()` one order at a time (its output
+captured instead of written to the terminal) against the batched `place_orders()` pipeline,
+sequential and fanned out to a process pool.
+
+Run from the repository root:
+
+    python -m benchmarks.abstract_factory_orders --orders 200000
+'''
+import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from creational.abstract_factory import BurgerFactory, PizzaFactory, place_order, place_orders
+
+
+def place_one_by_one(orders):
+    with contextlib.redirect_stdout(io.StringIO()):
+        for factory in orders:
+            place_order(factory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=4096)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    orders = [PizzaFactory() if n % 3 else BurgerFactory() for n in range(args.orders)]
+    with ProcessPoolExecutor(args.workers) as executor:
+        cases = {
+            'place_order()': lambda: place_one_by_one(orders),
+            'place_orders()': lambda: list(place_orders(orders, args.batch_size)),
+            f'place_orders(), {args.workers} processes':
+                lambda: list(place_orders(orders, args.batch_size, executor=executor)),
+        }
+        for name, run in cases.items():
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f'{name:>28}: {args.orders / elapsed:12,.0f} orders/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+'''
+Read latency of the Borg configuration: a plain in-process dict (the original
+`WebServerConfighBorg` state), the copy-on-write `ConfigStore`, the cross-process
+`SharedConfigStore` read through its seqlock, and the Borg's own properties. Every case reads
+both fields, as a request handler would.
+
+Run from the repository root:
+
+    python -m benchmarks.borg_read_latency
+'''
+import os
+import tempfile
+import timeit
+
+from creational.borg import ConfigStore, SharedConfigStore, WebServerConfighBorg
+
+
+def read_fields(config):
+    return config.port, config.root_directory
+
+
+def main(number=200_000, repeat=5):
+    shared_state = {'port': 8080, 'root_directory': '/var/www'}
+    store = ConfigStore(**shared_state)
+    borg = WebServerConfighBorg()
+    borg.set_config(**shared_state)
+    with tempfile.TemporaryDirectory() as directory:
+        shared = SharedConfigStore(os.path.join(directory, 'webserver.config'))
+        shared.update(**shared_state)
+        cases = {
+            'dict': lambda: (shared_state['port'], shared_state['root_directory']),
+            'ConfigStore': lambda: read_fields(store.snapshot()),
+            'SharedConfigStore': lambda: read_fields(shared.snapshot()),
+            'WebServerConfighBorg': lambda: (borg.port, borg.root_directory),
+        }
+        for name, read in cases.items():
+            best = min(timeit.repeat(read, number=number, repeat=repeat))
+            print(f'{name:>20}: {best / number * 1e9:8.1f} ns/read')
+        shared.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+'''
+Cost of `get_deployment_service()` per call: the previous implementation, which rebuilt its
+type dict on every call, against the registry with each caching policy.
+
+Run from the repository root:
+
+    python -m benchmarks.factory_lookup
+'''
+import timeit
+
+from creational.factory import (CloudDeployment, LocalDeployment, get_deployment_service,
+                                register_deployment_service)
+
+
+def get_deployment_service_per_call_dict(deployment_type):
+    deployment_typs = {
+        'cloud': CloudDeployment,
+        'local': LocalDeployment
+    }
+    return deployment_typs[deployment_type]()
+
+
+def main(number=1_000_000, repeat=5):
+    for policy in ('per-thread', 'shared'):
+        register_deployment_service(f'cloud-{policy}', CloudDeployment, policy=policy)
+    cases = {
+        'per-call dict (before)': lambda: get_deployment_service_per_call_dict('cloud'),
+        "registry, 'new'": lambda: get_deployment_service('cloud'),
+        "registry, 'per-thread'": lambda: get_deployment_service('cloud-per-thread'),
+        "registry, 'shared'": lambda: get_deployment_service('cloud-shared'),
+    }
+    for name, lookup in cases.items():
+        best = min(timeit.repeat(lookup, number=number, repeat=repeat))
+        print(f'{name:>24}: {best / number * 1e9:6.1f} ns/lookup')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''
+Guards the cold-start cost of the `creational` package: imports the package and each pattern
+module in a fresh interpreter with `-X importtime`, reports the cumulative import time, and fails
+if a module exceeds its budget or prints anything while being imported.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time --budget-ms 50
+'''
+import argparse
+import statistics
+import subprocess
+import sys
+
+import creational
+
+MODULES = ['creational', *(f'creational.{name}' for name in creational.__all__)]
+
+
+def import_time_us(module):
+    # Cumulative microseconds for `module`, as reported by -X importtime.
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        _, _, fields = line.partition('import time:')
+        parts = [part.strip() for part in fields.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]), result.stdout
+    raise RuntimeError(f'{module} missing from -X importtime output')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=50.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    failures = []
+    for module in MODULES:
+        runs = [import_time_us(module) for _ in range(args.repeat)]
+        median_ms = statistics.median(us for us, _ in runs) / 1000
+        output = runs[0][1]
+        status = 'ok'
+        if median_ms > args.budget_ms:
+            status = 'over budget'
+        if output:
+            status = 'prints on import'
+        if status != 'ok':
+            failures.append(module)
+        print(f'{module:>30}: {median_ms:7.2f} ms  {status}')
+    if failures:
+        sys.exit(f'import-time check failed for: {", ".join(failures)}')
+
+
+if __name__ == '__main__':
+    main()
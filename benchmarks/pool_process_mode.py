@@ -0,0 +1,72 @@
+'''
+Compares `WorkerPool` (thread mode) with `ProcessWorkerPool` (process mode) on a CPU-bound
+`Worker.process()` implementation, for an increasing number of workers.
+
+Run from the repository root:
+
+    python -m benchmarks.pool_process_mode --requests 2000 --work 20000
+'''
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from creational.pool_object import HTTPRequest, ProcessWorkerPool, Worker, WorkerPool
+
+
+class CPUBoundWorker(Worker):
+    def __init__(self, work=20000):
+        self.work = work
+
+    def process(self, request):
+        total = 0
+        for i in range(self.work):
+            total = (total * 31 + i + len(request.data)) % 1000003
+        return total
+
+
+def run_threads(workers, requests, work):
+    pool = WorkerPool(max_workers=workers, factory=partial(CPUBoundWorker, work))
+
+    def handle(request):
+        with pool.lease() as worker:
+            return worker.process(request)
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(handle, requests))
+
+
+def run_processes(workers, requests, work, batch_size):
+    with ProcessWorkerPool(max_workers=workers, factory=partial(CPUBoundWorker, work),
+                           batch_size=batch_size) as pool:
+        return pool.map(requests)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--work', type=int, default=20000)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    requests = [HTTPRequest(f"GET /api/{n}") for n in range(args.requests)]
+    counts = sorted({1, *(2 ** i for i in range(1, 8) if 2 ** i <= args.max_workers),
+                     args.max_workers})
+    print(f"{'workers':>8} {'threads (req/s)':>16} {'processes (req/s)':>18} {'speedup':>8}")
+    for workers in counts:
+        thread_time = timed(run_threads, workers, requests, args.work)
+        process_time = timed(run_processes, workers, requests, args.work, args.batch_size)
+        print(f"{workers:>8} {args.requests / thread_time:>16.0f} "
+              f"{args.requests / process_time:>18.0f} {thread_time / process_time:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''
+Cost of `Shape.clone()` compared with calling the constructor, the previous
+`self.__class__(**self.__dict__)` clone, `copy.copy` and `copy.deepcopy`, for `__dict__` and
+`__slots__` shapes with and without nested containers, and of bulk cloning through
+`PrototypeRegistry.clone_many()`.
+
+Run from the repository root:
+
+    python -m benchmarks.prototype_clone
+'''
+import copy
+import timeit
+
+from creational.prototype import Circle, PrototypeRegistry, Shape
+
+
+class SlottedCircle(Shape):
+    __slots__ = ('radius', 'center')
+
+    def __init__(self, radius, center=(0, 0)):
+        self.radius = radius
+        self.center = center
+
+
+class Styled(Shape):
+    def __init__(self, points, style):
+        self.points = points
+        self.style = style
+
+
+def main(number=100_000, repeat=5):
+    circle = Circle(radius=5)
+    slotted = SlottedCircle(radius=5)
+    styled = Styled([(x, x) for x in range(20)], {'colour': 'red', 'dash': (1, 2), 'tags': ['a']})
+    cases = {
+        'Circle(radius=5)': lambda: Circle(radius=5),
+        'Circle: old __dict__ clone': lambda: circle.__class__(**circle.__dict__),
+        'Circle: clone()': lambda: circle.clone(),
+        'Circle: copy.copy': lambda: copy.copy(circle),
+        'slotted: clone()': lambda: slotted.clone(),
+        'slotted: copy.copy': lambda: copy.copy(slotted),
+        'nested: clone(deep=True)': lambda: styled.clone(deep=True),
+        'nested: copy.deepcopy': lambda: copy.deepcopy(styled),
+    }
+    for name, clone in cases.items():
+        best = min(timeit.repeat(clone, number=number, repeat=repeat))
+        print(f'{name:>28}: {best / number * 1e9:8.1f} ns/clone')
+
+    registry = PrototypeRegistry()
+    registry.register('circle', circle)
+    batch = 1000
+    bulk = {
+        'clone() + setattr loop': lambda: [setattr(c := circle.clone(), 'radius', 7) or c
+                                           for _ in range(batch)],
+        'registry.clone_many()': lambda: registry.clone_many('circle', batch, radius=7),
+    }
+    for name, clone in bulk.items():
+        best = min(timeit.repeat(clone, number=number // batch, repeat=repeat))
+        print(f'{name:>28}: {best / number * 1e9:8.1f} ns/clone')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+'''
+Memory use and throughput of a columnar `ShapeBatch` against a list of `Circle` objects cloned
+from the same prototype: building N shapes, scaling them and computing their areas.
+
+Run from the repository root:
+
+    python -m benchmarks.shape_batch --shapes 1000000
+'''
+import argparse
+import time
+import tracemalloc
+
+from creational.prototype import Circle, PrototypeRegistry, ShapeBatch
+
+
+def measure(label, build, scale, area):
+    tracemalloc.start()
+    start = time.perf_counter()
+    shapes = build()
+    built = time.perf_counter()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    scale(shapes)
+    scaled = time.perf_counter()
+    area(shapes)
+    done = time.perf_counter()
+    print(f'{label:>16}: {memory / 2 ** 20:8.1f} MiB  build {built - start:6.3f}s  '
+          f'scale {scaled - built:6.3f}s  area {done - scaled:6.3f}s')
+
+
+def scale_objects(circles):
+    for circle in circles:
+        circle.radius *= 1.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shapes', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    registry = PrototypeRegistry()
+    registry.register('circle', Circle(radius=2.0))
+    measure('list of objects',
+            lambda: registry.clone_many('circle', args.shapes),
+            scale_objects,
+            lambda circles: [circle.area() for circle in circles])
+    measure('ShapeBatch',
+            lambda: ShapeBatch.from_prototype(registry.get('circle'), args.shapes),
+            lambda batch: batch.scale(1.5),
+            ShapeBatch.area)
+
+
+if __name__ == '__main__':
+    main()
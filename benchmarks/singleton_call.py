@@ -0,0 +1,47 @@
+'''
+Micro-benchmark of the `Singleton.__call__` hot path, i.e. every call after the instance exists,
+against the previous unlocked implementation and a plain module-level instance.
+
+Run from the repository root:
+
+    python -m benchmarks.singleton_call
+'''
+import timeit
+
+from creational.singleton import Singleton
+
+
+class UnlockedSingleton(type):
+    _instance = None
+
+    def __call__(self, *args, **kwargs):
+        if self._instance is None:
+            self._instance = super().__call__(*args, **kwargs)
+        return self._instance
+
+
+class Locked(metaclass=Singleton):
+    pass
+
+
+class Unlocked(metaclass=UnlockedSingleton):
+    pass
+
+
+plain = object()
+
+
+def main(number=1_000_000, repeat=5):
+    Locked(), Unlocked()
+    cases = {
+        'Singleton()': Locked,
+        'unlocked singleton()': Unlocked,
+        'module attribute': lambda: plain,
+    }
+    for name, call in cases.items():
+        best = min(timeit.repeat(call, number=number, repeat=repeat))
+        print(f'{name:>22}: {best / number * 1e9:6.1f} ns/call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+'''
+Benchmark suite for the hot paths of every pattern in `creational`: each case is warmed up,
+calibrated to a loop count that runs for at least --min-time seconds, then timed --repeat times.
+Results are summarised per operation (min, median, mean, stdev) and can be written as JSON, so
+runs from different commits can be compared. With --compare the suite fails if any case's median
+is more than --threshold percent slower than in the baseline file.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --compare before.json --threshold 10
+'''
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+from creational.abstract_factory import BurgerFactory, PizzaFactory, place_order, place_orders
+from creational.borg import SharedConfigStore, WebServerConfighBorg
+from creational.builder import TableBuilder
+from creational.factory import get_deployment_service
+from creational.pool_object import WorkerPool
+from creational.prototype import Circle, PrototypeRegistry
+from creational.singleton import Singleton
+
+CASES = {}
+
+
+def case(name, ops=1):
+    """Register a benchmark: a context manager yielding the function to time.
+    ops is the number of operations one call of that function performs."""
+    def register(setup):
+        CASES[name] = (contextlib.contextmanager(setup), ops)
+        return setup
+    return register
+
+
+@case('singleton.access')
+def singleton_access():
+    class Service(metaclass=Singleton):
+        pass
+    Service()
+    yield Service
+    Service.reset()
+
+
+@case('borg.read')
+def borg_read():
+    borg = WebServerConfighBorg()
+    borg.set_config(8080, '/var/www')
+    yield lambda: (borg.port, borg.root_directory)
+
+
+@case('borg.write')
+def borg_write():
+    borg = WebServerConfighBorg()
+    yield lambda: borg.set_config(8080, '/var/www')
+
+
+@case('borg.shared_read')
+def borg_shared_read():
+    with tempfile.TemporaryDirectory() as directory:
+        store = SharedConfigStore(os.path.join(directory, 'webserver.config'))
+        store.update(port=8080, root_directory='/var/www')
+        yield store.snapshot
+        store.close()
+
+
+@case('borg.shared_write')
+def borg_shared_write():
+    with tempfile.TemporaryDirectory() as directory:
+        store = SharedConfigStore(os.path.join(directory, 'webserver.config'))
+        yield lambda: store.update(port=8080, root_directory='/var/www')
+        store.close()
+
+
+@case('prototype.constructor')
+def prototype_constructor():
+    yield lambda: Circle(radius=5)
+
+
+@case('prototype.clone')
+def prototype_clone():
+    circle = Circle(radius=5)
+    yield lambda: circle.clone()
+
+
+@case('prototype.registry_clone_many', ops=1000)
+def prototype_registry_clone_many():
+    registry = PrototypeRegistry()
+    registry.register('circle', Circle(radius=5))
+    yield lambda: registry.clone_many('circle', 1000)
+    registry.close()
+
+
+@case('builder.wide_table', ops=1000)
+def builder_wide_table():
+    def build():
+        builder = TableBuilder('events')
+        for n in range(1000):
+            builder.add_column(f'column_{n}', 'int')
+        builder.add_primary_key('column_0')
+        return builder.get_table().to_ddl()
+    yield build
+
+
+@case('factory.lookup')
+def factory_lookup():
+    yield lambda: get_deployment_service('cloud')
+
+
+@case('abstract_factory.place_order')
+def abstract_factory_place_order():
+    factory = PizzaFactory()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        def run():
+            place_order(factory)
+            output.seek(0)
+            output.truncate()
+        yield run
+
+
+@case('abstract_factory.place_orders', ops=10_000)
+def abstract_factory_place_orders():
+    orders = [PizzaFactory() if n % 3 else BurgerFactory() for n in range(10_000)]
+    yield lambda: list(place_orders(orders))
+
+
+@case('pool.acquire_release')
+def pool_acquire_release():
+    pool = WorkerPool(max_workers=4)
+
+    def cycle():
+        pool.release_worker(pool.get_worker())
+    yield cycle
+
+
+@case('pool.contention', ops=8 * 500)
+def pool_contention():
+    # 8 threads share 4 workers, so half of them are waiting at any time.
+    pool = WorkerPool(max_workers=4)
+
+    def client():
+        for _ in range(500):
+            pool.release_worker(pool.get_worker(timeout=None))
+
+    def run():
+        threads = [threading.Thread(target=client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    yield run
+
+
+def measure(setup, ops, repeat, warmup, min_time):
+    with setup() as func:
+        timer = timeit.Timer(func)
+        number, elapsed = timer.autorange()
+        # autorange stops after >= 0.2 s; scale up to min_time.
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+        for _ in range(warmup):
+            timer.timeit(number)
+        runs = [timer.timeit(number) / (number * ops) * 1e9 for _ in range(repeat)]
+    return {
+        'number': number,
+        'ops': ops,
+        'min_ns': min(runs),
+        'median_ns': statistics.median(runs),
+        'mean_ns': statistics.fmean(runs),
+        'stdev_ns': statistics.stdev(runs) if len(runs) > 1 else 0.0,
+        'runs_ns': runs,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(results, baseline, threshold):
+    # Medians are compared; returns the names of the cases that regressed.
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        change = (result['median_ns'] / before['median_ns'] - 1) * 100
+        status = 'ok'
+        if change > threshold:
+            status = 'REGRESSION'
+            regressions.append(name)
+        print(f'{name:>34}: {before["median_ns"]:10.1f} -> {result["median_ns"]:10.1f} ns/op  '
+              f'{change:+6.1f}%  {status}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('cases', nargs='*', help='run only cases whose name contains one of these')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help='seconds each timed run should last')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help='JSON file from an earlier run to check for regressions')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percent slowdown of a median that counts as a regression')
+    args = parser.parse_args()
+
+    selected = [name for name in CASES
+                if not args.cases or any(part in name for part in args.cases)]
+    if not selected:
+        sys.exit(f'no benchmark matches {args.cases}; available: {", ".join(CASES)}')
+
+    results = {}
+    for name in selected:
+        setup, ops = CASES[name]
+        result = results[name] = measure(setup, ops, args.repeat, args.warmup, args.min_time)
+        print(f'{name:>34}: {result["median_ns"]:10.1f} ns/op  '
+              f'(min {result["min_ns"]:.1f}, stdev {result["stdev_ns"]:.1f})')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'environment': environment(), 'results': results}, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f'\ncompared with {args.compare} '
+              f'(commit {baseline["environment"]["commit"]}), threshold {args.threshold}%')
+        regressions = compare(results, baseline['results'], args.threshold)
+        if regressions:
+            sys.exit(f'benchmark regression in: {", ".join(regressions)}')
+
+
+if __name__ == '__main__':
+    main()
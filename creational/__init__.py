@@ -0,0 +1,31 @@
+'''
+Creational design patterns.
+
+Importing the package has no side effects: each pattern module is imported lazily the first
+time it is accessed as an attribute, e.g. `creational.pool_object.WorkerPool`.
+'''
+import importlib
+
+__all__ = [
+    'abstract_factory',
+    'borg',
+    'builder',
+    'factory',
+    'pool_object',
+    'prototype',
+    'schema_inference',
+    'singleton',
+    'tracing',
+]
+
+
+def __getattr__(name):
+    if name in __all__:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted({*globals(), *__all__})
@@ -29,16 +29,34 @@ corresponding abstract product classes and provide concrete implementations for
 uses it to create both a food item and a drink item. It then returns the preparation and serving 
 messages for the ordered items.
 
+6. **Batched Orders (`place_orders` function)**: For busy services, `place_orders` takes a stream
+of factories (one per order, or `place_orders_async` for an async stream), groups each batch of
+orders by factory, creates the food and drink only once per factory class and reuses their
+messages, and yields an `OrderRecord` per order instead of printing. Batches can be fanned out to
+a `concurrent.futures` executor.
+
 In essence, the Abstract Factory pattern allows you to create families of related objects (food 
 and drink items in this case) without specifying their concrete classes. This separation of 
 object creation from the client code enables you to easily switch between different types of 
 foods and drinks while maintaining a consistent interface for ordering and serving them.
 
 '''
-import doctest
+from collections import deque, namedtuple
+from itertools import islice
+
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
+OrderRecord = namedtuple('OrderRecord', ['order_id', 'factory', 'food', 'drink'])
 
 
 class ResturantFactory:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        tracing.instrument(cls, ('order_food', 'order_drink'), 'abstract_factory')
+
     def order_food(self):
         pass
     
@@ -89,6 +107,78 @@ def place_order(factory):
     print(food.prepare())
     print(drink.serve())
 
+
+# Products are stateless, so their messages only depend on the factory class:
+# (factory name, food message, drink message) per class, computed once.
+_menus = {}
+
+
+def _menu(factory):
+    try:
+        return _menus[type(factory)]
+    except KeyError:
+        food, drink = factory.order_food(), factory.order_drink()
+        menu = _menus[type(factory)] = (type(factory).__name__, food.prepare(), drink.serve())
+        return menu
+
+
+def _place_batch(first_order_id, factories):
+    # Orders are grouped by factory class so each group resolves its menu
+    # once; records come back in the original order.
+    groups = {}
+    for offset, factory in enumerate(factories):
+        groups.setdefault(type(factory), (factory, []))[1].append(offset)
+    records = [None] * len(factories)
+    make_record = OrderRecord._make
+    for factory, offsets in groups.values():
+        name, food, drink = _menu(factory)
+        for offset in offsets:
+            records[offset] = make_record((first_order_id + offset, name, food, drink))
+    return records
+
+
+def _batches(orders, batch_size):
+    orders = iter(orders)
+    first_order_id = 0
+    while batch := list(islice(orders, batch_size)):
+        yield first_order_id, batch
+        first_order_id += len(batch)
+
+
+def place_orders(orders, batch_size=1024, executor=None, prefetch=8):
+    """
+    Place a stream of orders, each given as a factory, and yield one
+    OrderRecord per order instead of printing. Batches can be fanned out to
+    a concurrent.futures executor, with at most `prefetch` batches in flight;
+    records keep the input order either way.
+    """
+    batches = _batches(orders, batch_size)
+    if executor is None:
+        for first_order_id, batch in batches:
+            yield from _place_batch(first_order_id, batch)
+        return
+    pending = deque()
+    for first_order_id, batch in batches:
+        pending.append(executor.submit(_place_batch, first_order_id, batch))
+        if len(pending) >= prefetch:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+
+async def place_orders_async(orders, batch_size=1024):
+    """Like place_orders(), for an async iterable of factories."""
+    batch, first_order_id = [], 0
+    async for factory in orders:
+        batch.append(factory)
+        if len(batch) == batch_size:
+            for record in _place_batch(first_order_id, batch):
+                yield record
+            first_order_id += len(batch)
+            batch = []
+    for record in _place_batch(first_order_id, batch):
+        yield record
+
 def main():
     '''
     # Order pizza and soda
@@ -100,6 +190,29 @@ def main():
     >>> order_burger = place_order(BurgerFactory())
     your burger will be prepared soon
     your water will be served soon
+
+    # Many orders at once, returned as records
+    >>> for record in place_orders([PizzaFactory(), BurgerFactory(), PizzaFactory()], batch_size=2):
+    ...     print(record.order_id, record.factory, record.food, '/', record.drink)
+    0 PizzaFactory your pizza will be prepared soon / your soda will be served soon
+    1 BurgerFactory your burger will be prepared soon / your water will be served soon
+    2 PizzaFactory your pizza will be prepared soon / your soda will be served soon
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> orders = [PizzaFactory() if n % 3 else BurgerFactory() for n in range(10000)]
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     records = list(place_orders(orders, batch_size=500, executor=executor))
+    >>> records == list(place_orders(orders)), [record.order_id for record in records] == list(range(10000))
+    (True, True)
+
+    >>> import asyncio
+    >>> async def incoming():
+    ...     for n in range(5):
+    ...         yield BurgerFactory()
+    >>> async def collect():
+    ...     return [record.order_id async for record in place_orders_async(incoming(), batch_size=2)]
+    >>> asyncio.run(collect())
+    [0, 1, 2, 3, 4]
     '''
     if __name__ == '__main__':
-        doctest.testmod()
\ No newline at end of file
+        import doctest
+        doctest.testmod()
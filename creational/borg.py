@@ -10,10 +10,21 @@ Here's an explanation of the example and its components:
    - This class represents a configuration manager for web servers.
    - It utilizes the Borg pattern to share configuration settings among instances.
    - The `_shared_state` class variable is used to maintain the shared state among instances.
+   - The configuration itself lives in a shared `ConfigStore`, which publishes every change as a
+    new immutable, versioned `ConfigSnapshot`. Readers get a consistent view without locking, and
+    subscribers are called with the old and new snapshot after each change.
    - The `set_config` method allows setting the configuration (port and root directory).
    - The `display_config` method displays the current configuration.
 
-2. **Usage**:
+2. **`SharedWebServerConfigBorg` Class**:
+   - The same Borg, but its state is shared across processes: a `SharedConfigStore` keeps the
+    configuration in a memory-mapped file with a fixed binary layout.
+   - A seqlock-style sequence number lets readers take consistent snapshots without locking, and
+    a write in one process is visible to every other process mapping the file.
+   - Subscribers are called from a background thread that polls the version, so they also hear
+    about changes written by other processes.
+
+3. **Usage**:
    - Two instances of the `WebServerConfigBorg` class (`server1` and `server2`) are created.
    - The `set_config` method is used to set the configuration for each instance.
    - The `display_config` method is used to display the configuration for each instance.
@@ -35,28 +46,471 @@ Please note that the Borg pattern is less common and less widely used than other
 but it can be handy in specific situations where shared state and individual identity are required.
 '''
 
+import mmap
+import os
+import struct
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within a process
+    fcntl = None
+
+
+class ConfigSnapshot(Mapping):
+    """
+    An immutable, versioned view of the configuration. Values are also
+    stored in slots of a subclass generated per set of keys, so reading
+    snapshot.port is a plain attribute lookup.
+    """
+    __slots__ = ('version', '_values')
+    _fields = ()
+    _classes = {}
+
+    def __new__(cls, version, values):
+        keys = tuple(values)
+        try:
+            klass = ConfigSnapshot._classes[keys]
+        except KeyError:
+            # Keys that are not identifiers or would shadow a method stay
+            # reachable through snapshot[key] only.
+            fields = tuple(key for key in keys if key.isidentifier()
+                           and not key.startswith('__') and not hasattr(ConfigSnapshot, key))
+            klass = ConfigSnapshot._classes.setdefault(keys, type(
+                'ConfigSnapshot', (ConfigSnapshot,), {'__slots__': fields, '_fields': fields}))
+        self = object.__new__(klass)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, '_values', values)
+        for name in klass._fields:
+            object.__setattr__(self, name, values[name])
+        return self
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ConfigSnapshot is immutable')
+
+    def __repr__(self):
+        return f'ConfigSnapshot(version={self.version}, {self._values!r})'
+
+
+class ConfigStore:
+    """
+    Copy-on-write configuration: every update publishes a new snapshot by
+    swapping a single reference, so readers never lock and never see a
+    half-applied update.
+    """
+
+    def __init__(self, **values):
+        self._snapshot = ConfigSnapshot(0, dict(values))
+        self._subscribers = []
+        self._write_lock = threading.Lock()
+
+    def snapshot(self):
+        return self._snapshot
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def update(self, **changes):
+        with self._write_lock:
+            old = self._snapshot
+            new = ConfigSnapshot(old.version + 1, {**old._values, **changes})
+            self._snapshot = new
+            subscribers = list(self._subscribers)
+        # Subscribers run on the writer's thread, after the swap.
+        for callback in subscribers:
+            callback(old, new)
+        return new
+
+    def subscribe(self, callback):
+        with self._write_lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._write_lock:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+
 class WebServerConfighBorg:
-    _shared_state = {}
+    _shared_state = {'_config': ConfigStore(port=None, root_directory=None)}
 
     def __init__(self):
         self.__dict__ = self._shared_state
 
+    @property
+    def port(self):
+        return self._config.snapshot().port
+
+    @property
+    def root_directory(self):
+        return self._config.snapshot().root_directory
+
+    def config(self):
+        return self._config.snapshot()
+
+    def subscribe(self, callback):
+        return self._config.subscribe(callback)
+
     def set_config(self, port, root_directory):
-        self.port = port
-        self.root_directory = root_directory
-    
+        self._config.update(port=port, root_directory=root_directory)
+
     def display_config(self):
-        print(f'Port: {self.port}\nRoot Directory: {self.root_directory}')
+        config = self._config.snapshot()
+        print(f'Port: {config.port}\nRoot Directory: {config.root_directory}')
+
+
+class SharedConfigStore:
+    """
+    A ConfigStore whose state lives in a memory-mapped file, so that every
+    process mapping the same path sees the same configuration.
+
+    The file holds a fixed-layout record guarded by a seqlock: writers make
+    the sequence number odd, write the fields and make it even again, and
+    readers retry whenever the number was odd or changed under them. Readers
+    never lock and never block writers.
+    """
+    MAGIC = b'BORG'
+    HEADER = struct.Struct('<4s4xQ')  # magic, padding, sequence number
+    FIELDS = {'port': 'I', 'root_directory': '256s'}
+    # A bitmask of the fields that are set (not None), then the fields.
+    PAYLOAD = struct.Struct('<B' + ''.join(FIELDS.values()))
+    SIZE = HEADER.size + PAYLOAD.size
+    SEQUENCE_OFFSET = 8
+    _stores = weakref.WeakSet()
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        self._pid = os.getpid()
+        self._write_lock = threading.Lock()
+        self._subscribers = []
+        self._poller = None  # polling thread, while anyone is subscribed
+        self._map = None
+        SharedConfigStore._stores.add(self)
+        with self._locked():
+            if os.fstat(self._fd).st_size == 0:
+                os.ftruncate(self._fd, self.SIZE)
+                os.pwrite(self._fd, self.HEADER.pack(self.MAGIC, 0), 0)
+        self._map = mmap.mmap(self._fd, self.SIZE)
+        if self.HEADER.unpack_from(self._map)[0] != self.MAGIC:
+            self.close()
+            raise ValueError(f'{path} is not a shared config file')
+        # Decoded snapshot of the last version read, reused until it changes.
+        self._cached = ConfigSnapshot(-1, {})
+
+    @contextmanager
+    def _locked(self):
+        # flock excludes other processes, the thread lock other threads
+        # sharing this file descriptor.
+        with self._write_lock:
+            if self._pid != os.getpid():
+                self._reopen()
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                if self._map is not None:
+                    self._recover()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _reopen(self):
+        # A forked child shares the parent's open file description, and with
+        # it the parent's flock: it needs a descriptor of its own.
+        fd = os.open(self.path, os.O_RDWR)
+        os.close(self._fd)
+        self._fd = fd
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _reset_after_fork():
+        # A thread lock held by a parent thread at fork time would never be
+        # released in the child.
+        for store in list(SharedConfigStore._stores):
+            store._write_lock = threading.Lock()
+            # Nor does the polling thread survive: subscriptions stay with the parent.
+            store._subscribers, store._poller = [], None
+
+    def _recover(self):
+        # With the lock held nobody is writing, so an odd sequence number means
+        # a writer died mid-update (e.g. a SIGKILLed worker). Making it even
+        # again unblocks readers; the next update rewrites every field.
+        sequence = self._read_sequence()
+        if sequence & 1:
+            struct.pack_into('<Q', self._map, self.SEQUENCE_OFFSET, sequence + 1)
+
+    def _read_sequence(self):
+        return struct.unpack_from('<Q', self._map, self.SEQUENCE_OFFSET)[0]
+
+    def _encode(self, values):
+        # Raises ValueError for values that do not fit the layout, before
+        # anything is written.
+        present, fields = 0, []
+        for bit, (name, code) in enumerate(self.FIELDS.items()):
+            value = values.get(name)
+            if value is not None:
+                present |= 1 << bit
+            if code.endswith('s'):
+                value = (value or '').encode()
+                if len(value) > int(code[:-1]) or b'\0' in value:
+                    raise ValueError(f'{name} must encode to at most {code[:-1]} bytes '
+                                     f'without NUL characters')
+            fields.append(0 if value is None else value)
+        try:
+            return self.PAYLOAD.pack(present, *fields)
+        except struct.error as e:
+            raise ValueError(f'cannot store {values!r}: {e}') from None
+
+    def _decode(self, payload):
+        present, *fields = payload
+        return {
+            # 'replace': a field may be torn by a writer that died mid-update.
+            name: (value.rstrip(b'\0').decode(errors='replace')
+                   if isinstance(value, bytes) else value)
+            if present & (1 << bit) else None
+            for bit, (name, value) in enumerate(zip(self.FIELDS, fields))
+        }
+
+    def snapshot(self):
+        cached = self._cached
+        if cached.version * 2 == self._read_sequence():
+            return cached
+        spins = 0
+        while True:
+            before = self._read_sequence()
+            if before & 1:
+                # Back off while a writer is busy; if it takes too long it may
+                # have died, and taking the lock repairs the sequence.
+                spins += 1
+                if spins % 100:
+                    time.sleep(0)
+                else:
+                    with self._locked():
+                        pass
+                continue
+            fields = self.PAYLOAD.unpack_from(self._map, self.HEADER.size)
+            if self._read_sequence() == before:
+                break
+        self._cached = ConfigSnapshot(before // 2, self._decode(fields))
+        return self._cached
+
+    @property
+    def version(self):
+        return self._read_sequence() // 2
+
+    def update(self, **changes):
+        unknown = changes.keys() - self.FIELDS.keys()
+        if unknown:
+            raise KeyError(f'unknown config fields: {sorted(unknown)}')
+        with self._locked():
+            sequence = self._read_sequence()
+            values = {**self.snapshot(), **changes}
+            payload = self._encode(values)
+            struct.pack_into('<Q', self._map, self.SEQUENCE_OFFSET, sequence + 1)
+            self._map[self.HEADER.size:self.SIZE] = payload
+            struct.pack_into('<Q', self._map, self.SEQUENCE_OFFSET, sequence + 2)
+        return ConfigSnapshot(sequence // 2 + 1, values)
+
+    def subscribe(self, callback, interval=0.05):
+        """
+        Call callback(old, new) whenever the version changes, whichever
+        process made the change. A background thread polls the version every
+        interval seconds, so writes between two polls are reported as one.
+        """
+        with self._write_lock:
+            self._subscribers.append(callback)
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll,
+                                                args=(self.snapshot(), interval), daemon=True)
+                self._poller.start()
+
+        def unsubscribe():
+            with self._write_lock:
+                self._subscribers.remove(callback)
+        return unsubscribe
+
+    def _poll(self, old, interval):
+        # Exits once the last subscriber is gone; subscribe() starts a new one.
+        while True:
+            time.sleep(interval)
+            with self._write_lock:
+                subscribers = list(self._subscribers)
+                if not subscribers:
+                    self._poller = None
+                    return
+            new = self.snapshot()
+            if new.version != old.version:
+                for callback in subscribers:
+                    callback(old, new)
+                old = new
+
+    def close(self):
+        with self._write_lock:
+            self._subscribers.clear()
+            poller = self._poller
+        if poller is not None and poller is not threading.current_thread():
+            poller.join()
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        os.close(self._fd)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=SharedConfigStore._reset_after_fork)
+
+
+class SharedWebServerConfigBorg(WebServerConfighBorg):
+    """
+    WebServerConfighBorg whose state is shared across processes, e.g. the
+    workers of a pre-forked web server, through a SharedConfigStore file.
+    """
+    _shared_state = {}
+
+    def __init__(self, path=None):
+        self.__dict__ = self._shared_state
+        if '_config' not in self._shared_state:
+            if path is None:
+                raise ValueError('the first instance needs the path of the shared config file')
+            self._config = SharedConfigStore(path)
+
+
+def main():
+    '''
+    >>> server1, server2 = WebServerConfighBorg(), WebServerConfighBorg()
+    >>> server1.set_config(8080, "/var/www")
+    >>> server2.display_config()
+    Port: 8080
+    Root Directory: /var/www
+    >>> server2.port, server2.config()
+    (8080, ConfigSnapshot(version=1, {'port': 8080, 'root_directory': '/var/www'}))
+
+    # Subscribers are told about every new version
+    >>> changes = []
+    >>> unsubscribe = server1.subscribe(lambda old, new: changes.append((old.version, new.version)))
+    >>> server2.set_config(8000, "/opt/web")
+    >>> unsubscribe()
+    >>> server1.set_config(8000, "/srv/web")
+    >>> changes, server1.config().version
+    ([(1, 2)], 3)
+
+    # Snapshots never mix values from different writes
+    >>> done = threading.Event()
+    >>> def write():
+    ...     for n in range(2000):
+    ...         server1.set_config(*((8080, "/var/www") if n % 2 else (8000, "/opt/web")))
+    ...     done.set()
+    >>> torn = []
+    >>> def read():
+    ...     while not done.is_set():
+    ...         config = server2.config()
+    ...         if (config.port, config.root_directory) not in {(8080, "/var/www"), (8000, "/opt/web")}:
+    ...             torn.append(config)
+    >>> threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(4)]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> torn
+    []
+
+    # Processes mapping the same file share one configuration
+    >>> import multiprocessing, tempfile
+    >>> directory = tempfile.TemporaryDirectory()
+    >>> path = os.path.join(directory.name, 'webserver.config')
+    >>> shared = SharedWebServerConfigBorg(path)
+    >>> shared.config()
+    ConfigSnapshot(version=0, {'port': None, 'root_directory': None})
+    >>> def reconfigure():
+    ...     SharedWebServerConfigBorg().set_config(9090, "/srv/www")
+    >>> process = multiprocessing.get_context('fork').Process(target=reconfigure)
+    >>> process.start(); process.join()
+
+    # A child forked while the parent writes waits for the parent's lock
+    >>> with shared._config._locked():
+    ...     process = multiprocessing.get_context('fork').Process(target=reconfigure)
+    ...     process.start(); process.join(timeout=0.5)
+    ...     process.is_alive()
+    True
+    >>> process.join(); process.exitcode
+    0
+    >>> SharedWebServerConfigBorg().display_config()
+    Port: 9090
+    Root Directory: /srv/www
+    >>> other = SharedConfigStore(path)
+    >>> new = SharedConfigStore(path + '.new')
+    >>> new.update(port=80)
+    ConfigSnapshot(version=1, {'port': 80, 'root_directory': None})
+    >>> new.close()
+    >>> other.update(port=9091).version, shared.config()
+    (3, ConfigSnapshot(version=3, {'port': 9091, 'root_directory': '/srv/www'}))
+
+    # Values are stored as given, or rejected before anything is written
+    >>> other.update(port=0, root_directory='').port, other.snapshot().root_directory
+    (0, '')
+    >>> other.update(root_directory='/' + 'a' * 254 + 'é')
+    Traceback (most recent call last):
+    ValueError: root_directory must encode to at most 256 bytes without NUL characters
+    >>> other.update(port=-1)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ValueError: cannot store {'port': -1, 'root_directory': ''}
+    >>> other.snapshot()
+    ConfigSnapshot(version=4, {'port': 0, 'root_directory': ''})
+
+    # A writer that dies mid-update leaves the sequence odd; readers and writers recover
+    >>> sequence = other._read_sequence()
+    >>> struct.pack_into('<Q', other._map, other.SEQUENCE_OFFSET, sequence + 1)
+    >>> other.snapshot()
+    ConfigSnapshot(version=5, {'port': 0, 'root_directory': ''})
+    >>> struct.pack_into('<Q', other._map, other.SEQUENCE_OFFSET, sequence + 3)
+    >>> other.update(port=8080).version
+    7
+    >>> other.update(port=0).version
+    8
+
+    # Subscribers hear about changes made through any mapping of the file
+    >>> changes, changed = [], threading.Event()
+    >>> def record(old, new):
+    ...     changes.append((old.version, new.version, new.port))
+    ...     changed.set()
+    >>> unsubscribe = shared.subscribe(record)
+    >>> _ = other.update(port=8443)
+    >>> changed.wait(timeout=5), changes
+    (True, [(8, 9, 8443)])
+    >>> unsubscribe()
+    >>> other.close()
+    >>> shared._config.close()
+    >>> SharedWebServerConfigBorg._shared_state.clear()
+    >>> directory.cleanup()
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()
 
 
-# Usage
-server1 = WebServerConfighBorg()
-server2 = WebServerConfighBorg()
+if __name__ == '__main__':
+    server1 = WebServerConfighBorg()
+    server2 = WebServerConfighBorg()
 
-server1.set_config(8080, "/var/www")
-server2.display_config()  # Output: Port: 8080, Root Directory: /var/www
-print('-------------')
-server2.set_config(8000, "/opt/web")
-server1.display_config()  # Output: Port: 8000, Root Directory: /opt/web
-print('********')
-server2.display_config()  # Output: Port: 8000, Root Directory: /opt/web
\ No newline at end of file
+    server1.set_config(8080, "/var/www")
+    server2.display_config()  # Output: Port: 8080, Root Directory: /var/www
+    print('-------------')
+    server2.set_config(8000, "/opt/web")
+    server1.display_config()  # Output: Port: 8000, Root Directory: /opt/web
+    print('********')
+    server2.display_config()  # Output: Port: 8000, Root Directory: /opt/web
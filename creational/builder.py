@@ -17,10 +17,21 @@ Here's a breakdown of the components and their roles in the example:
    - This is the product class that represents the complex object being built 
     (a database table).
    - It holds information about the table's name, columns, and primary key.
+   - Columns are kept in definition order together with a name index, so looking up, renaming
+    (`change_column_name()`) and dropping a column, as well as detecting duplicate names, take
+    constant time even on very wide tables. The primary key follows column renames.
+   - `columns` is a read-only tuple, cached until a column is added or dropped.
+   - It renders itself as text (`str()`) or as `CREATE TABLE` DDL for PostgreSQL, MySQL or SQLite
+    (`to_ddl()`). Both are built from chunk iterators (`iter_text()`, `iter_ddl()`) that `write()`
+    can stream to a file, and the rendered result is cached until the table is modified.
 
-3. **`Column`**:
+3. **`SchemaInferenceBuilder`** (in `schema_inference.py`):
+   - A front end that drives a `TableBuilder` from data instead of hand-written code: it streams a
+    large CSV or JSON-lines file, infers each column's type, and picks a primary key.
+
+4. **`Column`**:
    - This is a simple class representing a column in a database table. It stores the column 
-    name and data type.
+    name and data type, using `__slots__` and interned type names to keep wide schemas small.
 
 In this example, the `TableBuilder` acts as the builder, guiding the creation of a `Table` 
 object step by step. The client code (main program) uses the builder to create a table 
@@ -41,46 +52,209 @@ complex object involves multiple steps or when you want to create different conf
 the same object without exposing the underlying details to the client.
 '''
 
+import sys
+
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
+
 class TableBuilder:
     def __init__(self, name):
-        self.table = Table(name)
+        if tracing.enabled:
+            self.table = tracing.trace('builder', 'Table', Table, name)
+        else:
+            self.table = Table(name)
 
     def add_column(self, column_name, column_type):
-        self.table.add_column(Column(column_name, column_type))
+        if tracing.enabled:
+            column = tracing.trace('builder', 'Column', Column, column_name, column_type)
+        else:
+            column = Column(column_name, column_type)
+        self.table.add_column(column)
 
     def add_primary_key(self, column_name):
         self.table.set_primary_key(column_name)
 
     def change_column_name(self, column_name, new_column_name):
-        raise NotImplementedError
-    
+        self.table.rename_column(column_name, new_column_name)
+
+    def drop_column(self, column_name):
+        self.table.drop_column(column_name)
+
     def get_table(self):
         return self.table
 
+class Dialect:
+    def __init__(self, name, quote_char, types):
+        self.name = name
+        self.quote_char = quote_char
+        self.types = types
+
+    def quote(self, identifier):
+        q = self.quote_char
+        return f"{q}{identifier.replace(q, q + q)}{q}"
+
+    def column_type(self, data_type):
+        # Unknown types are passed through, so dialect-specific ones work too.
+        return self.types.get(data_type.lower(), data_type)
+
+
+DIALECTS = {dialect.name: dialect for dialect in (
+    Dialect('postgresql', '"', {'int': 'INTEGER', 'string': 'TEXT', 'float': 'DOUBLE PRECISION',
+                                'bool': 'BOOLEAN', 'date': 'DATE', 'datetime': 'TIMESTAMP'}),
+    Dialect('mysql', '`', {'int': 'INT', 'string': 'VARCHAR(255)', 'float': 'DOUBLE',
+                           'bool': 'TINYINT(1)', 'date': 'DATE', 'datetime': 'DATETIME'}),
+    Dialect('sqlite', '"', {'int': 'INTEGER', 'string': 'TEXT', 'float': 'REAL',
+                            'bool': 'INTEGER', 'date': 'TEXT', 'datetime': 'TEXT'}),
+)}
+
+
 class Table:
     def __init__(self, name):
-        self.name = name
-        self.columns = []
-        self.primary_key = None
-    
+        self._name = name
+        # Columns in definition order (used as an ordered set), plus a
+        # name index so lookups, renames and drops never scan the columns.
+        self._columns = {}
+        self._index = {}
+        self._column_tuple = None  # cached `columns`, until a column is added or dropped
+        self._primary_key = None
+        # Rendered text and DDL, dropped by every mutation below.
+        self._rendered = {}
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._rendered.clear()
+
+    @property
+    def columns(self):
+        """The columns in definition order, as a read-only tuple; use the
+        add/rename/drop methods to change them."""
+        if self._column_tuple is None:
+            self._column_tuple = tuple(self._columns)
+        return self._column_tuple
+
+    @property
+    def primary_key(self):
+        if isinstance(self._primary_key, tuple):
+            return tuple(column.name for column in self._primary_key)
+        return self._primary_key.name if self._primary_key else None
+
+    def _primary_key_columns(self):
+        if isinstance(self._primary_key, tuple):
+            return self._primary_key
+        return (self._primary_key,) if self._primary_key else ()
+
+    def __contains__(self, column_name):
+        return column_name in self._index
+
+    def __len__(self):
+        return len(self._columns)
+
+    def get_column(self, column_name):
+        return self._index[column_name]
+
     def add_column(self, column):
-        self.columns.append(column)
+        if column.name in self._index:
+            raise ValueError(f"column {column.name!r} already exists in table {self.name!r}")
+        self._index[column.name] = column
+        self._columns[column] = None
+        self._column_tuple = None
+        self._rendered.clear()
+
+    def drop_column(self, column_name):
+        column = self._index.pop(column_name)
+        del self._columns[column]
+        self._column_tuple = None
+        if column in self._primary_key_columns():
+            self._primary_key = None
+        self._rendered.clear()
+
+    def rename_column(self, column_name, new_column_name):
+        column = self._index[column_name]
+        if new_column_name == column_name:
+            return
+        if new_column_name in self._index:
+            raise ValueError(f"column {new_column_name!r} already exists in table {self.name!r}")
+        del self._index[column_name]
+        column._name = new_column_name
+        self._index[new_column_name] = column
+        self._rendered.clear()
 
     def set_primary_key(self, column_name):
-        self.primary_key = column_name
+        # The key refers to the Column objects, so it follows renames.
+        if isinstance(column_name, str):
+            self._primary_key = self._index[column_name]
+        else:
+            self._primary_key = tuple(self._index[name] for name in column_name)
+        self._rendered.clear()
+
+    def iter_text(self):
+        yield f"Table: {self.name}\n"
+        for column in self._columns:
+            yield f"- {column}\n"
+        primary_key = self._primary_key_columns()
+        if primary_key:
+            yield f"Primary Key: {', '.join(column.name for column in primary_key)}"
+
+    def iter_ddl(self, dialect='postgresql'):
+        dialect = DIALECTS[dialect]
+        yield f"CREATE TABLE {dialect.quote(self.name)} (\n"
+        separator = ''
+        for column in self._columns:
+            yield f"{separator}    {dialect.quote(column.name)} {dialect.column_type(column.data_type)}"
+            separator = ',\n'
+        primary_key = self._primary_key_columns()
+        if primary_key:
+            names = ', '.join(dialect.quote(column.name) for column in primary_key)
+            yield f"{separator}    PRIMARY KEY ({names})"
+        yield "\n);\n"
+
+    def write(self, file, dialect=None):
+        # Streams chunk by chunk unless the full text is already cached.
+        key = dialect or 'text'
+        if key in self._rendered:
+            file.write(self._rendered[key])
+        else:
+            file.writelines(self.iter_ddl(dialect) if dialect else self.iter_text())
+
+    def to_ddl(self, dialect='postgresql'):
+        try:
+            return self._rendered[dialect]
+        except KeyError:
+            ddl = self._rendered[dialect] = ''.join(self.iter_ddl(dialect))
+            return ddl
 
     def __str__(self):
-        table_info = f"Table: {self.name}\n"
-        for column in self.columns:
-            table_info += f"- {column}\n"
-        if self.primary_key:
-            table_info += f"Primary Key: {''.join(self.primary_key)}"
-        return table_info
+        try:
+            return self._rendered['text']
+        except KeyError:
+            text = self._rendered['text'] = ''.join(self.iter_text())
+            return text
     
 class Column:
+    # Read-only: the owning Table indexes columns by name and caches its
+    # rendering, so renames go through Table.rename_column().
+    __slots__ = ('_name', '_data_type')
+
     def __init__(self, name, data_type):
-        self.name = name
-        self.data_type = data_type
+        self._name = name
+        # Wide schemas repeat a handful of type names thousands of times.
+        self._data_type = sys.intern(data_type)
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def data_type(self):
+        return self._data_type
     
     def __str__(self):
         return f"{self.name} ({self.data_type})"
@@ -97,6 +271,66 @@ def main():
     - id (int)
     - name (string)
     Primary Key: id
+
+    >>> my_table.change_column_name('id', 'user_id')
+    >>> my_table.add_column('email', 'string')
+    >>> my_table.drop_column('name')
+    >>> print(my_table.get_table())
+    Table: user
+    - user_id (int)
+    - email (string)
+    Primary Key: user_id
+    >>> my_table.add_column('email', 'text')
+    Traceback (most recent call last):
+    ...
+    ValueError: column 'email' already exists in table 'user'
+
+    # Wide tables: lookups and renames do not depend on the number of columns
+    >>> wide = TableBuilder('events')
+    >>> for n in range(5000):
+    ...     wide.add_column(f'field_{n}', ''.join(['var', 'char']))
+    >>> wide.add_primary_key(['field_0', 'field_1'])
+    >>> wide.change_column_name('field_1', 'event_id')
+    >>> table = wide.get_table()
+    >>> len(table), table.primary_key, table.get_column('field_4999').data_type
+    (5000, ('field_0', 'event_id'), 'varchar')
+    >>> table.columns[1].name, 'field_1' in table
+    ('event_id', False)
+    >>> len({id(column.data_type) for column in table.columns})
+    1
+    >>> table.columns is table.columns, type(table.columns).__name__
+    (True, 'tuple')
+    >>> wide.change_column_name('event_id', 'event_id')
+    >>> table.columns[1].name
+    'event_id'
+    >>> table.get_column('event_id').name = 'id'  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    AttributeError: ...
+
+    # Rendering is cached until the table changes, and can be streamed as DDL
+    >>> str(table) is str(table)
+    True
+    >>> my_table.add_primary_key(['user_id', 'email'])
+    >>> print(my_table.get_table().to_ddl('mysql'))
+    CREATE TABLE `user` (
+        `user_id` INT,
+        `email` VARCHAR(255),
+        PRIMARY KEY (`user_id`, `email`)
+    );
+    <BLANKLINE>
+    >>> import io
+    >>> out = io.StringIO()
+    >>> my_table.add_column('score', 'float')
+    >>> my_table.get_table().write(out, dialect='postgresql')
+    >>> print(out.getvalue())
+    CREATE TABLE "user" (
+        "user_id" INTEGER,
+        "email" TEXT,
+        "score" DOUBLE PRECISION,
+        PRIMARY KEY ("user_id", "email")
+    );
+    <BLANKLINE>
     '''
     if __name__ == "__main__":
         import doctest
@@ -13,36 +13,301 @@ focused on using the services rather than creating them.
 modifying the existing client code.
 - Promoting a more modular and maintainable design by centralizing object creation.
 
+New deployment services are added by decorating them with `register_deployment_service()`, or,
+for third-party packages, by declaring an entry point in the `creational.deployment_services`
+group; such a backend is only imported the first time it is requested. Installed entry points are
+read once, on the first lookup of an unregistered type. Each service type can also
+choose whether `get_deployment_service()` returns a new instance on every call (`'new'`), one
+instance per thread (`'per-thread'`), or a single shared instance (`'shared'`).
+
+`DeployOrchestrator` deploys a list of `(deployment_type, target)` pairs through the factory
+concurrently, using either threads or asyncio, with a concurrency limit, per-target timeouts and
+retries, and yields a `DeployResult` for each target as soon as it is done.
+
 In the provided example, the client code creates instances of different deployment services 
 using the Factory (`DeploymentService`). It then utilizes these services to deploy an 
 application. The Factory pattern helps manage the creation of complex objects with varying
 functionalities in a flexible and organized manner.
 '''
 
-from typing import Protocol
+import functools
+import threading
+import time
+from typing import Any, NamedTuple, Optional, Protocol
+
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
+ENTRY_POINT_GROUP = 'creational.deployment_services'
+CACHE_POLICIES = ('new', 'per-thread', 'shared')
+
+# Deployment type -> zero-argument callable returning the service, already
+# wrapped according to its caching policy, so a lookup is one dict access.
+_deployment_services = {}
 
 class DeploymentService(Protocol):
-    def deploy(self):
+    def deploy(self, target=None):
         raise NotImplementedError()
 
 
+def _create(deployment_type, factory):
+    if tracing.enabled:
+        return tracing.trace('factory', deployment_type, factory)
+    return factory()
+
+
+def _cached(deployment_type, factory, policy):
+    # Cached services are traced where they are actually built, not on
+    # every lookup; get_deployment_service() traces the 'new' policy.
+    if policy == 'new':
+        return factory
+    if policy == 'per-thread':
+        local = threading.local()
+
+        def per_thread():
+            try:
+                return local.instance
+            except AttributeError:
+                local.instance = _create(deployment_type, factory)
+                return local.instance
+        per_thread.cached = True
+        return per_thread
+    if policy == 'shared':
+        lock = threading.Lock()
+        instance = None
+
+        def shared():
+            nonlocal instance
+            if instance is None:
+                with lock:
+                    if instance is None:
+                        instance = _create(deployment_type, factory)
+            return instance
+        shared.cached = True
+        return shared
+    raise ValueError(f'cache policy must be one of {CACHE_POLICIES}')
+
+
+def register_deployment_service(deployment_type, factory=None, policy=None):
+    """
+    Register a service class (or any factory callable) under deployment_type.
+    Usable as a decorator. The policy defaults to the class's cache_policy
+    attribute, or 'new' for a new instance on every lookup.
+    """
+    def register(factory):
+        _deployment_services[deployment_type] = _cached(
+            deployment_type, factory, policy or getattr(factory, 'cache_policy', 'new'))
+        return factory
+    if factory is None:
+        return register
+    return register(factory)
+
+
+@functools.lru_cache(maxsize=None)
+def _entry_points():
+    # Name -> entry point. Scanning the installed distributions is slow, and
+    # an unknown type may be looked up on every deploy, so it is done once.
+    from importlib.metadata import entry_points
+    found = {}
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        found.setdefault(entry_point.name, entry_point)
+    return found
+
+
+def _discover(deployment_type):
+    # Third-party backends declare an entry point in ENTRY_POINT_GROUP; the
+    # backend module is only imported the first time its type is requested.
+    entry_point = _entry_points().get(deployment_type)
+    if entry_point is None:
+        raise KeyError(deployment_type)
+    register_deployment_service(deployment_type, entry_point.load())
+    return _deployment_services[deployment_type]
+
+
+@register_deployment_service('cloud')
 class CloudDeployment:
-    def deploy(self):
+    def deploy(self, target=None):
         return 'cloud-deploy'
     
 
 
+@register_deployment_service('local')
 class LocalDeployment:
-    def deploy(self):
+    def deploy(self, target=None):
         return 'local-deploy'
 
 
 def get_deployment_service(deployment_type: str) -> DeploymentService:
-    deployment_typs = {
-        'cloud': CloudDeployment,
-        'local': LocalDeployment
-    }
-    return deployment_typs[deployment_type]()
+    try:
+        factory = _deployment_services[deployment_type]
+    except KeyError:
+        factory = _discover(deployment_type)
+    if tracing.enabled and not getattr(factory, 'cached', False):
+        return tracing.trace('factory', deployment_type, factory)
+    return factory()
+
+
+class DeployResult(NamedTuple):
+    deployment_type: str
+    target: Any
+    ok: bool
+    result: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+
+def _start_in_thread(call):
+    from concurrent.futures import Future
+    future = Future()
+
+    def attempt():
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+    threading.Thread(target=attempt, daemon=True).start()
+    return future
+
+
+def _release_when_done(running, release):
+    # A blocking deploy cannot be interrupted: after a timeout it keeps its
+    # concurrency slot until it actually returns.
+    def done(future):
+        if not future.cancelled():
+            future.exception()  # retrieved, so asyncio does not log it
+        release()
+    running.add_done_callback(done)
+
+
+class DeployOrchestrator:
+    """
+    Deploys many (deployment_type, target) pairs concurrently, with at most
+    max_concurrency deploys in flight, a per-attempt timeout, and up to
+    `retries` retries with exponential backoff. Results are yielded as
+    DeployResult records in completion order.
+
+    run() uses threads; run_async() uses asyncio and awaits services whose
+    deploy() is a coroutine function, while blocking deploy() methods run in
+    a thread. Coroutine deploys are cancelled on timeout and retried. A
+    blocking deploy that times out cannot be stopped: its target is not
+    retried, and it counts against max_concurrency until it returns.
+    """
+
+    def __init__(self, max_concurrency=8, timeout=None, retries=0, backoff=0.1):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+
+    def _backoff(self, attempts):
+        return self.backoff * 2 ** (attempts - 1)
+
+    def _deploy(self, deployment_type, target, slots):
+        import inspect
+        started = time.monotonic()
+        attempts = 0
+        running = None
+        slots.acquire()
+        try:
+            try:
+                service = get_deployment_service(deployment_type)
+            except KeyError as e:
+                return DeployResult(deployment_type, target, False, error=e)
+            if inspect.iscoroutinefunction(service.deploy):
+                import asyncio
+                call = lambda: asyncio.run(service.deploy(target))  # noqa: E731
+            else:
+                call = lambda: service.deploy(target)  # noqa: E731
+            while True:
+                attempts += 1
+                try:
+                    if self.timeout is None:
+                        result = call()
+                    else:
+                        running = _start_in_thread(call)
+                        result = running.result(self.timeout)
+                except Exception as e:
+                    still_running = running is not None and not running.done()
+                    if still_running or attempts > self.retries:
+                        return DeployResult(deployment_type, target, False, error=e,
+                                            attempts=attempts, elapsed=time.monotonic() - started)
+                    time.sleep(self._backoff(attempts))
+                else:
+                    return DeployResult(deployment_type, target, True, result, attempts=attempts,
+                                        elapsed=time.monotonic() - started)
+        finally:
+            if running is None:
+                slots.release()
+            else:
+                _release_when_done(running, slots.release)
+
+    def run(self, jobs):
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+        executor = ThreadPoolExecutor(self.max_concurrency)
+        slots = threading.Semaphore(self.max_concurrency)
+        try:
+            futures = [executor.submit(self._deploy, deployment_type, target, slots)
+                       for deployment_type, target in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _deploy_async(self, deployment_type, target, slots):
+        import asyncio
+        import inspect
+        started = time.monotonic()
+        attempts = 0
+        running = None
+        await slots.acquire()
+        try:
+            try:
+                service = get_deployment_service(deployment_type)
+            except KeyError as e:
+                return DeployResult(deployment_type, target, False, error=e)
+            native = inspect.iscoroutinefunction(service.deploy)
+            loop = asyncio.get_running_loop()
+            while True:
+                attempts += 1
+                if native:
+                    call = service.deploy(target)
+                else:
+                    # Shielded, so that a timeout does not hide a thread that
+                    # is still running.
+                    running = loop.run_in_executor(None, service.deploy, target)
+                    call = asyncio.shield(running)
+                try:
+                    result = await asyncio.wait_for(call, self.timeout)
+                except Exception as e:
+                    still_running = running is not None and not running.done()
+                    if still_running or attempts > self.retries:
+                        return DeployResult(deployment_type, target, False, error=e,
+                                            attempts=attempts, elapsed=time.monotonic() - started)
+                    await asyncio.sleep(self._backoff(attempts))
+                else:
+                    return DeployResult(deployment_type, target, True, result, attempts=attempts,
+                                        elapsed=time.monotonic() - started)
+        finally:
+            if running is None:
+                slots.release()
+            else:
+                _release_when_done(running, slots.release)
+
+    async def run_async(self, jobs):
+        import asyncio
+        slots = asyncio.Semaphore(self.max_concurrency)
+        tasks = [asyncio.ensure_future(self._deploy_async(deployment_type, target, slots))
+                 for deployment_type, target in jobs]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
 
 def main():
     '''
@@ -50,7 +315,123 @@ def main():
     cloud-deploy
     >>> print(get_deployment_service('local').deploy())
     local-deploy
+
+    # New backends register themselves, with an instance caching policy
+    >>> @register_deployment_service('edge', policy='shared')
+    ... class EdgeDeployment:
+    ...     def deploy(self):
+    ...         return 'edge-deploy'
+    >>> get_deployment_service('edge') is get_deployment_service('edge')
+    True
+    >>> get_deployment_service('cloud') is get_deployment_service('cloud')
+    False
+    >>> _ = register_deployment_service('k8s', EdgeDeployment, policy='per-thread')
+    >>> services = []
+    >>> thread = threading.Thread(target=lambda: services.append(get_deployment_service('k8s')))
+    >>> thread.start(); thread.join()
+    >>> services[0] is get_deployment_service('k8s') is get_deployment_service('k8s')
+    False
+    >>> get_deployment_service('k8s') is get_deployment_service('k8s')
+    True
+
+    # Installed packages can provide backends through entry points
+    >>> import os, sys, tempfile
+    >>> site_packages = tempfile.TemporaryDirectory()
+    >>> site = site_packages.name
+    >>> os.mkdir(os.path.join(site, 'lambda_backend-1.0.dist-info'))
+    >>> with open(os.path.join(site, 'lambda_backend-1.0.dist-info', 'METADATA'), 'w') as file:
+    ...     _ = file.write('Name: lambda-backend\\nVersion: 1.0\\n')
+    >>> with open(os.path.join(site, 'lambda_backend-1.0.dist-info', 'entry_points.txt'), 'w') as file:
+    ...     _ = file.write(f'[{ENTRY_POINT_GROUP}]\\nlambda = lambda_backend:LambdaDeployment\\n')
+    >>> with open(os.path.join(site, 'lambda_backend.py'), 'w') as file:
+    ...     _ = file.write('class LambdaDeployment:\\n    def deploy(self):\\n        return "lambda-deploy"\\n')
+    >>> sys.path.append(site)
+    >>> 'lambda_backend' in sys.modules
+    False
+    >>> print(get_deployment_service('lambda').deploy())
+    lambda-deploy
+    >>> 'lambda_backend' in sys.modules
+    True
+    >>> get_deployment_service('ftp')
+    Traceback (most recent call last):
+    ...
+    KeyError: 'ftp'
+
+    # Deploying to many targets concurrently, with timeouts and retries
+    >>> failures = {}
+    >>> @register_deployment_service('flaky')
+    ... class FlakyDeployment:
+    ...     def deploy(self, target=None):
+    ...         failures[target] = failures.get(target, 0) + 1
+    ...         if failures[target] < 2:
+    ...             raise ConnectionError(target)
+    ...         return f'flaky-deploy {target}'
+    >>> hung_calls = []
+    >>> @register_deployment_service('hung')
+    ... class HungDeployment:
+    ...     def deploy(self, target=None):
+    ...         hung_calls.append(target)
+    ...         time.sleep(1)
+    >>> orchestrator = DeployOrchestrator(max_concurrency=16, timeout=0.2, retries=1, backoff=0)
+    >>> jobs = [('cloud', f'host-{n}') for n in range(50)] + [('flaky', 'db-1'), ('hung', 'gpu-1')]
+    >>> results = list(orchestrator.run(jobs + [('ftp', 'legacy')]))
+    >>> len(results), sum(result.ok for result in results)
+    (53, 51)
+    >>> sorted((r.target, r.attempts, type(r.error).__name__) for r in results
+    ...        if not r.ok or r.attempts != 1)
+    [('db-1', 2, 'NoneType'), ('gpu-1', 1, 'TimeoutError'), ('legacy', 0, 'KeyError')]
+    >>> [r.result for r in results if r.target == 'db-1']
+    ['flaky-deploy db-1']
+
+    # A timed-out blocking deploy is not retried while it may still be running,
+    # and keeps its slot: the next deploy only starts once it has returned
+    >>> in_flight, peak = [], []
+    >>> @register_deployment_service('slow')
+    ... class SlowDeployment:
+    ...     def deploy(self, target=None):
+    ...         in_flight.append(target)
+    ...         peak.append(len(in_flight))
+    ...         time.sleep(0.2)
+    ...         in_flight.remove(target)
+    >>> serial = DeployOrchestrator(max_concurrency=1, timeout=0.05, retries=3, backoff=0)
+    >>> [(r.target, r.attempts) for r in serial.run([('slow', 'a'), ('slow', 'b')])]
+    [('a', 1), ('b', 1)]
+    >>> max(peak)
+    1
+
+    # The asyncio backend awaits native coroutine deploys
+    >>> import asyncio
+    >>> @register_deployment_service('async-cloud')
+    ... class AsyncCloudDeployment:
+    ...     async def deploy(self, target=None):
+    ...         await asyncio.sleep(0.01)
+    ...         return f'async-deploy {target}'
+    >>> async def deploy_all():
+    ...     jobs = [('async-cloud', n) for n in range(200)] + [('local', 'laptop'), ('hung', 'gpu-2')]
+    ...     return [result async for result in orchestrator.run_async(jobs)]
+    >>> results = asyncio.run(deploy_all())
+    >>> len(results), sorted(r.target for r in results if not r.ok)
+    (202, ['gpu-2'])
+    >>> hung_calls
+    ['gpu-1', 'gpu-2']
+    >>> peak.clear()
+    >>> async def deploy_slowly():
+    ...     return [(r.target, r.attempts) async for r in serial.run_async([('slow', 'c'), ('slow', 'd')])]
+    >>> asyncio.run(deploy_slowly()), max(peak)
+    ([('c', 1), ('d', 1)], 1)
+    >>> sorted(results, key=lambda r: str(r.target))[0].result
+    'async-deploy 0'
+
+    # Leave the registry and sys.path as they were
+    >>> for deployment_type in ('edge', 'k8s', 'lambda', 'flaky', 'hung', 'slow', 'async-cloud'):
+    ...     del _deployment_services[deployment_type]
+    >>> sys.path.remove(site)
+    >>> del sys.modules['lambda_backend']
+    >>> _entry_points.cache_clear()
+    >>> site_packages.cleanup()
+    >>> sorted(_deployment_services)
+    ['cloud', 'local']
     '''
     if __name__ == "__main__":
         import doctest
-        doctest.testmod()
\ No newline at end of file
+        doctest.testmod()
@@ -16,6 +16,35 @@ Here's a breakdown of the components and their roles in the example:
    - Manages a collection of worker objects, both available (idle) and busy (processing requests).
    - Provides methods to acquire a worker from the pool (`get_worker()`) and release it back to the
     pool after processing (`release_worker()`).
+   - Is safe to share between threads: `get_worker(timeout=...)` waits on a condition variable
+    for a worker to be released, and `lease()` wraps acquire/release in a context manager.
+   - Grows elastically between `min_workers` (created up front) and `max_workers`, building workers
+    with a `factory` callable, dropping workers idle for longer than `idle_timeout` (checked on
+    every acquire and release, and by a background reaper so an idle pool shrinks too), and
+    re-checking idle workers with an optional `validate` hook before handing them out.
+   - `stats()` returns a snapshot of busy/idle counts; pass `metrics=PoolMetrics()` to also
+    collect acquire wait-time and lease hold-time histograms, rejection, creation and eviction
+    counts, and to receive each event through hook callbacks.
+
+4. **`ProcessWorkerPool` Class**:
+   - Runs one worker per process in a `ProcessPoolExecutor`, so CPU-heavy `process()`
+    implementations are not serialized by the GIL.
+   - `submit()` returns a future per request; requests are pickled and shipped `batch_size` at a
+    time to amortize the IPC cost. A partially filled batch is sent after `linger` seconds, or
+    right away by `flush()`.
+
+5. **`RequestDispatcher` Class**:
+   - A bounded queue in front of a `WorkerPool` that accepts a stream of `HTTPRequest`s and feeds
+    them to free workers, returning a future per request.
+   - When the queue is full it applies backpressure according to its policy: `block` the caller,
+    `drop_oldest` queued request, or `reject` the new one with `QueueFull`.
+   - With `batch_size` > 1, small requests queued together are handled under a single lease.
+
+6. **`AsyncWorkerPool` Class**:
+   - The asyncio counterpart of `WorkerPool`, handing out `AsyncWorker` objects whose `process()`
+    is a coroutine.
+   - `await pool.acquire()` and `async with pool.lease()` suspend the coroutine instead of blocking
+    a thread, and released workers are handed to waiters in FIFO order.
 
 In this scenario, the Object Pool pattern is used to efficiently manage worker objects that 
 are used to process incoming HTTP requests in a web server. Instead of creating a new worker for 
@@ -38,46 +67,777 @@ Overall, the Object Pool pattern helps optimize resource usage and improve the e
 processing tasks that involve the creation and reuse of objects, such as managing worker threads 
 in a web server.
 '''
+import math
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
+
 class Worker:
     def process(self, request):
         pass
 
 
+class AsyncWorker(Worker):
+    async def process(self, request):
+        pass
+
+
 class HTTPRequest:
     def __init__(self, data):
         self.data = data
 
 
+class PoolExhausted(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class RequestDropped(Exception):
+    pass
+
+
+class Histogram:
+    # Upper bounds in seconds; the last bucket catches everything slower.
+    BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, math.inf)
+
+    def __init__(self):
+        self.counts = [0] * len(self.BOUNDS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th percentile.
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.BOUNDS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': dict(zip(self.BOUNDS, self.counts)),
+        }
+
+
+class PoolMetrics:
+    """
+    Opt-in counters for a WorkerPool. A pool created without metrics only pays
+    an `is None` check per acquire and release.
+
+    Hooks are called as hook(event, value) on the acquiring or releasing
+    thread, with event one of 'acquire' (wait time), 'release' (hold time),
+    'reject', 'create', 'discard' or 'evict' (number of workers).
+    """
+
+    def __init__(self, hooks=()):
+        self.hooks = list(hooks)
+        self.wait_times = Histogram()
+        self.hold_times = Histogram()
+        self.counters = dict.fromkeys(
+            ('acquired', 'released', 'rejected', 'created', 'discarded', 'evicted'), 0)
+        self.peak_busy = 0
+        self._leased_at = {}
+        self._lock = threading.Lock()
+
+    def _emit(self, event, value):
+        for hook in self.hooks:
+            hook(event, value)
+
+    def record_acquire(self, worker, wait, busy):
+        with self._lock:
+            self.wait_times.observe(wait)
+            self.counters['acquired'] += 1
+            self.peak_busy = max(self.peak_busy, busy)
+            self._leased_at[worker] = time.monotonic()
+        self._emit('acquire', wait)
+
+    def record_release(self, worker):
+        with self._lock:
+            hold = time.monotonic() - self._leased_at.pop(worker, time.monotonic())
+            self.hold_times.observe(hold)
+            self.counters['released'] += 1
+        self._emit('release', hold)
+
+    def record(self, counter, event, count=1):
+        with self._lock:
+            self.counters[counter] += count
+        self._emit(event, count)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                **self.counters,
+                'peak_busy': self.peak_busy,
+                'wait_time': self.wait_times.snapshot(),
+                'hold_time': self.hold_times.snapshot(),
+            }
+
+
 class WorkerPool:
+    def __init__(self, max_workers, min_workers=0, factory=Worker, idle_timeout=None,
+                 validate=None, metrics=None):
+        if not 0 <= min_workers <= max_workers:
+            raise ValueError('min_workers must be between 0 and max_workers')
+        self.max_workers = max_workers
+        self.min_workers = min_workers
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self.validate = validate
+        self.metrics = metrics
+        # Idle workers are reused from the right, so the left end holds the
+        # workers that have been idle the longest.
+        self.available_workers = deque(factory() for _ in range(min_workers))
+        self.busy_workers = set()
+        self._idle_since = dict.fromkeys(self.available_workers, time.monotonic())
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._worker_released = threading.Condition(self._lock)
+        if metrics is not None and min_workers:
+            metrics.record('created', 'create', min_workers)
+        if idle_timeout:
+            # Holds only a weak reference, so the pool can still be collected.
+            threading.Thread(target=_reap_idle_workers, args=(weakref.ref(self), idle_timeout),
+                             daemon=True).start()
+
+    def size(self):
+        return len(self.available_workers) + len(self.busy_workers) + self._pending
+
+    def stats(self):
+        with self._lock:
+            snapshot = {
+                'time': time.time(),
+                'busy': len(self.busy_workers),
+                'idle': len(self.available_workers),
+                'pending': self._pending,
+                'max_workers': self.max_workers,
+            }
+        if self.metrics is not None:
+            snapshot.update(self.metrics.snapshot())
+        return snapshot
+
+    def get_worker(self, timeout=0):
+        # timeout=0 keeps the old fail-fast behaviour, None waits forever.
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        metrics = self.metrics
+        if self.idle_timeout is not None:
+            self.evict_idle()
+        while True:
+            try:
+                with self._worker_released:
+                    worker = self._reserve(deadline)
+            except PoolExhausted:
+                if metrics is not None:
+                    metrics.record('rejected', 'reject')
+                raise
+            # The factory and the health check run outside the lock; the slot
+            # is held in _pending meanwhile so max_workers cannot be exceeded.
+            try:
+                if worker is None:
+                    if tracing.enabled:
+                        name = getattr(self.factory, '__name__', type(self.factory).__name__)
+                        worker = tracing.trace('pool', name, self.factory)
+                    else:
+                        worker = self.factory()
+                    if metrics is not None:
+                        metrics.record('created', 'create')
+                elif self.validate is not None and not self.validate(worker):
+                    self._discard_reservation()
+                    if metrics is not None:
+                        metrics.record('discarded', 'discard')
+                    continue
+            except BaseException:
+                self._discard_reservation()
+                raise
+            with self._lock:
+                self._pending -= 1
+                self.busy_workers.add(worker)
+                busy = len(self.busy_workers)
+            if metrics is not None:
+                metrics.record_acquire(worker, time.monotonic() - started, busy)
+            return worker
+
+    def _reserve(self, deadline):
+        while True:
+            if self.available_workers:
+                worker = self.available_workers.pop()
+                del self._idle_since[worker]
+                self._pending += 1
+                return worker
+            if self.size() < self.max_workers:
+                self._pending += 1
+                return None
+            if deadline is None:
+                self._worker_released.wait()
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolExhausted('No available workers')
+            self._worker_released.wait(remaining)
+
+    def _discard_reservation(self):
+        with self._worker_released:
+            self._pending -= 1
+            self._worker_released.notify()
+
+    def release_worker(self, worker):
+        with self._worker_released:
+            try:
+                self.busy_workers.remove(worker)
+            except KeyError:
+                raise ValueError('worker does not belong to this pool') from None
+            self.available_workers.append(worker)
+            self._idle_since[worker] = time.monotonic()
+            self._worker_released.notify()
+        if self.metrics is not None:
+            self.metrics.record_release(worker)
+        self.evict_idle()
+
+    def evict_idle(self):
+        if self.idle_timeout is None:
+            return 0
+        evicted = 0
+        with self._lock:
+            expired = time.monotonic() - self.idle_timeout
+            while (self.available_workers and self.size() > self.min_workers
+                   and self._idle_since[self.available_workers[0]] <= expired):
+                del self._idle_since[self.available_workers.popleft()]
+                evicted += 1
+        if evicted and self.metrics is not None:
+            self.metrics.record('evicted', 'evict', evicted)
+        return evicted
+
+    @contextmanager
+    def lease(self, timeout=None):
+        worker = self.get_worker(timeout=timeout)
+        try:
+            yield worker
+        finally:
+            self.release_worker(worker)
+
+
+def _reap_idle_workers(pool_ref, interval):
+    # Evicts idle workers of a pool that nobody is using any more, so its size
+    # follows the load down after a spike; stops once the pool is collected.
+    while True:
+        time.sleep(interval)
+        pool = pool_ref()
+        if pool is None:
+            return
+        pool.evict_idle()
+        del pool
+
+
+class AsyncWorkerPool:
     def __init__(self, max_workers):
         self.max_workers = max_workers
         self.available_workers = []
-        self.busy_workers = []
+        self.busy_workers = set()
+        self._waiters = deque()
 
-    def get_worker(self):
-        if not self.available_workers:
-            if len(self.busy_workers) < self.max_workers:
-                worker = Worker()
-                self.busy_workers.append(worker)
-                return worker
-            else:
-                raise Exception('No available workers')
-        else:
+    async def acquire(self, timeout=None):
+        if self.available_workers:
             worker = self.available_workers.pop()
-            self.busy_workers.append(worker)
-            return worker
-        
+        elif len(self.busy_workers) < self.max_workers:
+            worker = AsyncWorker()
+        else:
+            return await self._wait_for_worker(timeout)
+        self.busy_workers.add(worker)
+        return worker
+
+    async def _wait_for_worker(self, timeout):
+        # Released workers are handed straight to the oldest waiter and stay
+        # in busy_workers, so newcomers can never jump the queue.
+        import asyncio
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            if timeout is None:
+                return await waiter
+            return await asyncio.wait_for(waiter, timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # Woken with a worker but cancelled, or timed out in the same
+                # loop iteration, before resuming: pass the worker on.
+                self.release_worker(waiter.result())
+            if isinstance(e, asyncio.TimeoutError):
+                raise PoolExhausted('No available workers') from None
+            raise
+        finally:
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
     def release_worker(self, worker):
+        if worker not in self.busy_workers:
+            raise ValueError('worker does not belong to this pool')
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(worker)
+                return
         self.busy_workers.remove(worker)
         self.available_workers.append(worker)
 
+    @asynccontextmanager
+    async def lease(self, timeout=None):
+        worker = await self.acquire(timeout=timeout)
+        try:
+            yield worker
+        finally:
+            self.release_worker(worker)
 
-pool = WorkerPool(max_workers=5)
 
-try:
-    worker = pool.get_worker()
-    request = HTTPRequest("GET /api/data")
-    worker.process(request)
-    pool.release_worker(worker)
-except Exception as e:
-    print(e)
+class RequestDispatcher:
+    POLICIES = ('block', 'drop_oldest', 'reject')
+
+    def __init__(self, pool, maxsize, policy='block', batch_size=1, threads=None):
+        if policy not in self.POLICIES:
+            raise ValueError(f'policy must be one of {self.POLICIES}')
+        self.pool = pool
+        self.maxsize = maxsize
+        self.policy = policy
+        self.batch_size = batch_size
+        self._queue = deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._threads = [threading.Thread(target=self._run, daemon=True)
+                         for _ in range(threads or pool.max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, request, timeout=None):
+        future = Future()
+        dropped = None
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('dispatcher is closed')
+            if len(self._queue) >= self.maxsize:
+                if self.policy == 'reject':
+                    raise QueueFull('Request queue is full')
+                if self.policy == 'drop_oldest':
+                    _, dropped = self._queue.popleft()
+                elif not self._not_full.wait_for(
+                        lambda: self._closed or len(self._queue) < self.maxsize, timeout):
+                    raise QueueFull('Request queue is full')
+                elif self._closed:
+                    raise RuntimeError('dispatcher is closed')
+            self._queue.append((request, future))
+            self._not_empty.notify()
+        # Resolve outside the lock, done callbacks may submit again.
+        if dropped is not None and dropped.set_running_or_notify_cancel():
+            dropped.set_exception(RequestDropped('Request dropped from a full queue'))
+        return future
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft()
+                         for _ in range(min(self.batch_size, len(self._queue)))]
+                self._not_full.notify(len(batch))
+            batch = [(request, future) for request, future in batch
+                     if future.set_running_or_notify_cancel()]
+            if batch:
+                self._process_batch(batch)
+
+    def _process_batch(self, batch):
+        # A micro-batch is handled by a single lease.
+        try:
+            with self.pool.lease() as worker:
+                for request, future in batch:
+                    try:
+                        future.set_result(worker.process(request))
+                    except Exception as e:
+                        future.set_exception(e)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def close(self, wait=True):
+        # Requests already queued are still processed.
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Each process of a ProcessWorkerPool holds exactly one worker, built by the
+# executor initializer and reused for every batch the process receives.
+_process_worker = None
+
+
+def _start_process_worker(factory):
+    global _process_worker
+    _process_worker = factory()
+
+
+def _process_batch(requests):
+    results = []
+    for request in requests:
+        try:
+            results.append((True, _process_worker.process(request)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+def _resolve_batch(futures, batch):
+    try:
+        results = batch.result()
+    except BaseException as e:
+        for future in futures:
+            future.set_exception(e)
+        return
+    for future, (ok, value) in zip(futures, results):
+        if ok:
+            future.set_result(value)
+        else:
+            future.set_exception(value)
+
+
+class ProcessWorkerPool:
+    """
+    One worker per process. Requests are buffered and sent batch_size at a
+    time; a batch that is not full yet is sent linger seconds after its
+    first request, so every future resolves without an explicit flush().
+    With linger=None partial batches wait for flush(), map() or shutdown().
+    """
+
+    def __init__(self, max_workers, factory=Worker, batch_size=32, mp_context=None,
+                 linger=0.005):
+        self.max_workers = max_workers
+        self.factory = factory
+        self.batch_size = batch_size
+        self.linger = linger
+        # Imported here, multiprocessing is expensive to import.
+        from concurrent.futures import ProcessPoolExecutor
+        self._executor = ProcessPoolExecutor(max_workers, mp_context=mp_context,
+                                             initializer=_start_process_worker,
+                                             initargs=(factory,))
+        self._batch = []
+        self._lock = threading.Lock()
+
+    def submit(self, request):
+        future = Future()
+        with self._lock:
+            self._batch.append((request, future))
+            if len(self._batch) < self.batch_size:
+                if len(self._batch) == 1 and self.linger is not None:
+                    timer = threading.Timer(self.linger, self._flush_batch, (self._batch,))
+                    timer.daemon = True
+                    timer.start()
+                return future
+            batch, self._batch = self._batch, []
+        self._dispatch(batch)
+        return future
+
+    def flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch:
+            self._dispatch(batch)
+
+    def _flush_batch(self, batch):
+        # Linger timer: sends batch unless it was already sent full or flushed.
+        with self._lock:
+            if self._batch is not batch:
+                return
+            self._batch = []
+        self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        batch = [(request, future) for request, future in batch
+                 if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        requests = [request for request, _ in batch]
+        futures = [future for _, future in batch]
+        self._executor.submit(_process_batch, requests).add_done_callback(
+            partial(_resolve_batch, futures))
+
+    def map(self, requests):
+        futures = [self.submit(request) for request in requests]
+        self.flush()
+        return [future.result() for future in futures]
+
+    def shutdown(self, wait=True):
+        self.flush()
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+
+def main():
+    '''
+    >>> pool = WorkerPool(max_workers=1)
+    >>> worker = pool.get_worker()
+    >>> pool.get_worker()  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    PoolExhausted: No available workers
+    >>> pool.get_worker(timeout=0.01)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    PoolExhausted: No available workers
+    >>> pool.release_worker(worker)
+    >>> with pool.lease() as leased:
+    ...     leased is worker
+    True
+    >>> pool.release_worker(worker)
+    Traceback (most recent call last):
+    ...
+    ValueError: worker does not belong to this pool
+
+    # Hundreds of threads competing for a handful of workers
+    >>> pool = WorkerPool(max_workers=4)
+    >>> seen, peak = set(), []
+    >>> def handle(n):
+    ...     with pool.lease(timeout=10) as worker:
+    ...         seen.add(worker)
+    ...         peak.append(len(pool.busy_workers))
+    ...         worker.process(HTTPRequest(f"GET /api/{n}"))
+    >>> threads = [threading.Thread(target=handle, args=(n,)) for n in range(300)]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> len(peak), len(seen) <= 4, max(peak) <= 4
+    (300, True, True)
+    >>> len(pool.busy_workers), len(pool.available_workers) == len(seen)
+    (0, True)
+
+    # Pre-warmed, elastic pools shrink back to min_workers once idle
+    >>> pool = WorkerPool(max_workers=4, min_workers=2, idle_timeout=0)
+    >>> len(pool.available_workers), pool.size()
+    (2, 2)
+    >>> workers = [pool.get_worker() for _ in range(4)]
+    >>> pool.size()
+    4
+    >>> for worker in workers:
+    ...     pool.release_worker(worker)
+    >>> len(pool.available_workers), len(pool.busy_workers)
+    (2, 0)
+
+    # ...even when no one uses the pool after the spike
+    >>> pool = WorkerPool(max_workers=4, min_workers=1, idle_timeout=0.05)
+    >>> workers = [pool.get_worker() for _ in range(4)]
+    >>> for worker in workers:
+    ...     pool.release_worker(worker)
+    >>> pool.size()
+    4
+    >>> time.sleep(0.3)
+    >>> pool.size()
+    1
+
+    # Metrics are opt-in: stats() always reports sizes, plus counters and
+    # wait/hold time histograms when the pool has a PoolMetrics
+    >>> events = []
+    >>> pool = WorkerPool(max_workers=2, min_workers=1, idle_timeout=0,
+    ...                   metrics=PoolMetrics(hooks=[lambda event, value: events.append(event)]))
+    >>> with pool.lease(), pool.lease():
+    ...     pool.get_worker()  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    PoolExhausted: No available workers
+    >>> stats = pool.stats()
+    >>> stats['busy'], stats['idle'], stats['peak_busy']
+    (0, 1, 2)
+    >>> {name: stats[name] for name in ('acquired', 'released', 'rejected', 'created', 'evicted')}
+    {'acquired': 2, 'released': 2, 'rejected': 1, 'created': 2, 'evicted': 1}
+    >>> stats['wait_time']['count'], stats['hold_time']['count']
+    (2, 2)
+    >>> events
+    ['create', 'acquire', 'create', 'acquire', 'reject', 'release', 'evict', 'release']
+    >>> sorted(WorkerPool(max_workers=1).stats())
+    ['busy', 'idle', 'max_workers', 'pending', 'time']
+
+    # Workers failing the health check are replaced on acquire
+    >>> class FlakyWorker(Worker):
+    ...     healthy = True
+    >>> pool = WorkerPool(max_workers=1, factory=FlakyWorker,
+    ...                   validate=lambda worker: worker.healthy)
+    >>> broken = pool.get_worker()
+    >>> broken.healthy = False
+    >>> pool.release_worker(broken)
+    >>> replacement = pool.get_worker()
+    >>> replacement is broken, pool.size()
+    (False, 1)
+
+    # A bounded queue in front of the pool applies backpressure
+    >>> with RequestDispatcher(WorkerPool(max_workers=2), maxsize=8, batch_size=4) as dispatcher:
+    ...     futures = [dispatcher.submit(HTTPRequest(f"GET /api/{n}")) for n in range(100)]
+    >>> [future.result() for future in futures] == [None] * 100
+    True
+    >>> started, gate = threading.Event(), threading.Event()
+    >>> class GatedWorker(Worker):
+    ...     def process(self, request):
+    ...         started.set()
+    ...         gate.wait()
+    ...         return request.data
+    >>> def saturate(policy):
+    ...     started.clear()
+    ...     gate.clear()
+    ...     pool = WorkerPool(max_workers=1, factory=GatedWorker)
+    ...     dispatcher = RequestDispatcher(pool, maxsize=2, policy=policy)
+    ...     futures = [dispatcher.submit(HTTPRequest('a'))]
+    ...     started.wait()
+    ...     futures += [dispatcher.submit(HTTPRequest(data)) for data in 'bc']
+    ...     return dispatcher, futures
+    >>> dispatcher, futures = saturate('reject')
+    >>> dispatcher.submit(HTTPRequest('d'))  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    QueueFull: Request queue is full
+    >>> gate.set(); dispatcher.close()
+    >>> [future.result() for future in futures]
+    ['a', 'b', 'c']
+    >>> dispatcher, futures = saturate('drop_oldest')
+    >>> futures.append(dispatcher.submit(HTTPRequest('d')))
+    >>> gate.set(); dispatcher.close()
+    >>> [future.exception() or future.result() for future in futures]
+    ['a', RequestDropped('Request dropped from a full queue'), 'c', 'd']
+    >>> dispatcher, futures = saturate('block')
+    >>> dispatcher.submit(HTTPRequest('d'), timeout=0.01)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    QueueFull: Request queue is full
+    >>> gate.set(); dispatcher.close()
+
+    # CPU-bound work can run in worker processes, shipped in batches
+    >>> with ProcessWorkerPool(max_workers=2, batch_size=4) as process_pool:
+    ...     results = process_pool.map(HTTPRequest(f"GET /api/{n}") for n in range(10))
+    ...     pending = process_pool.submit(HTTPRequest("GET /api/last"))
+    >>> len(results), set(results), pending.result()
+    (10, {None}, None)
+
+    # A partial batch is sent on its own after the linger delay
+    >>> with ProcessWorkerPool(max_workers=1, batch_size=32) as process_pool:
+    ...     process_pool.submit(HTTPRequest("GET /api/alone")).result(timeout=10)
+
+    # Thousands of coroutines sharing a small set of async workers
+    >>> import asyncio
+    >>> async def serve(pool, n):
+    ...     async with pool.lease() as worker:
+    ...         await worker.process(HTTPRequest(f"GET /api/{n}"))
+    ...         await asyncio.sleep(0)
+    ...         return worker
+    >>> async def serve_all(pool):
+    ...     return await asyncio.gather(*(serve(pool, n) for n in range(2000)))
+    >>> async_pool = AsyncWorkerPool(max_workers=8)
+    >>> len(set(asyncio.run(serve_all(async_pool))))
+    8
+    >>> len(async_pool.busy_workers), len(async_pool.available_workers)
+    (0, 8)
+
+    # Waiters are served first come, first served, and a cancelled waiter
+    # does not leak the worker it was handed
+    >>> async def handoff():
+    ...     pool = AsyncWorkerPool(max_workers=1)
+    ...     worker = await pool.acquire()
+    ...     order = []
+    ...     async def wait(name):
+    ...         async with pool.lease(timeout=1):
+    ...             order.append(name)
+    ...     cancelled = asyncio.create_task(pool.acquire())
+    ...     first = asyncio.create_task(wait('first'))
+    ...     second = asyncio.create_task(wait('second'))
+    ...     await asyncio.sleep(0)
+    ...     pool.release_worker(worker)
+    ...     cancelled.cancel()
+    ...     await asyncio.gather(first, second, return_exceptions=True)
+    ...     await asyncio.gather(cancelled, return_exceptions=True)
+    ...     return order, len(pool.busy_workers), len(pool.available_workers)
+    >>> asyncio.run(handoff())
+    (['first', 'second'], 0, 1)
+    >>> async def timeout():
+    ...     pool = AsyncWorkerPool(max_workers=1)
+    ...     await pool.acquire()
+    ...     try:
+    ...         await pool.acquire(timeout=0.01)
+    ...     except PoolExhausted as e:
+    ...         return str(e), len(pool._waiters)
+    >>> asyncio.run(timeout())
+    ('No available workers', 0)
+
+    # A worker released in the same loop iteration as the timeout is not lost
+    >>> async def release_at_timeout():
+    ...     pool = AsyncWorkerPool(max_workers=1)
+    ...     worker = await pool.acquire()
+    ...     loop = asyncio.get_running_loop()
+    ...     loop.call_at(loop.time() + 0.01, pool.release_worker, worker)
+    ...     try:
+    ...         pool.release_worker(await pool.acquire(timeout=0.01))
+    ...     except PoolExhausted:
+    ...         pass
+    ...     return len(pool.busy_workers), len(pool.available_workers)
+    >>> asyncio.run(release_at_timeout())
+    (0, 1)
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()
+
+
+if __name__ == '__main__':
+    pool = WorkerPool(max_workers=5)
+
+    try:
+        with pool.lease() as worker:
+            request = HTTPRequest("GET /api/data")
+            worker.process(request)
+    except PoolExhausted as e:
+        print(e)
@@ -8,20 +8,37 @@ Here's a breakdown of the components and their roles in this example:
 
 1. **`Shape` (Abstract Base Class)**:
    - This is an abstract base class (ABC) that defines a common interface for all shapes.
-   - It declares an abstract method `clone()`, which should be implemented by its concrete subclasses.
+   - It implements `clone()` for all of its subclasses. The clone is created without calling
+    `__init__`, and its attributes are copied from both `__dict__` and `__slots__`.
+   - `clone(deep=True)` copies nested mutable containers too, while immutable values (numbers,
+    strings, tuples of immutables, ...) are shared with the prototype instead of being rebuilt.
 
 2. **`Circle` and `Square` (Concrete Classes)**:
-   - These are concrete subclasses of `Shape` that implement the `clone()` method.
-   - Each subclass initializes its properties (radius or side) and then creates a new instance of the
-    same class with the same properties using the `__dict__` attribute.
+   - These are concrete subclasses of `Shape` that inherit the `clone()` method.
+   - Each subclass initializes its properties (radius or side) in its constructor.
 
 3. **Prototype Creation**:
    - Instances of `Circle` and `Square` are created as prototype objects
     (`circle_prototype` and `Square_prototype`), representing initial shapes.
-   - The `clone()` method in each prototype class uses the `__dict__` attribute to create a 
-   new instance with the same attributes.
+   - The `clone()` method creates a new instance with the same attributes.
 
-4. **Object Creation Using Prototypes**:
+4. **`PrototypeRegistry`**:
+   - Stores named prototypes and clones them on request, optionally overriding attributes of the
+    clones (`clone(name, **overrides)`).
+   - `clone_many(name, n, **overrides)` creates many customized copies in one go.
+   - With a `pool_size`, a background thread keeps a stock of ready clones for each prototype, so a
+    burst of `clone()` calls mostly just takes an object from the stock.
+   - `save()` writes the prototypes to a compact binary snapshot and `load()` maps it with `mmap`,
+    unpickling each prototype only when it is first cloned. A snapshot saved for another version
+    is rebuilt automatically.
+
+5. **`ShapeBatch`**:
+   - Holds N clones of a prototype column-wise, with one `array` per numeric attribute
+    (struct-of-arrays) instead of N objects, each with its own `__dict__`.
+   - Supports bulk updates and computations over the whole batch (`set()`, `scale()`, `area()`),
+    and materializes individual `Shape` objects on indexing.
+
+6. **Object Creation Using Prototypes**:
    - The `clone()` method is used to create new instances of shapes (`circle1` and `square1`) 
     based on the prototype objects.
    - The new instances have the same attributes as the prototypes.
@@ -31,42 +48,664 @@ instances of shapes by cloning existing prototype objects. It's useful when you
 objects with the same initial properties as existing ones, thus reducing the overhead of object 
 creation and improving performance.
 
-Please note that while the example demonstrates the concept of the Prototype pattern, the specific 
-implementation may not provide a deep copy, especially if the shape objects contain 
-references to other objects. In a production scenario, you might need to handle deep copying or 
-other considerations depending on your requirements.
+Please note that the default `clone()` is a shallow copy: if the shape objects contain references
+to other objects, those are shared with the prototype. Use `clone(deep=True)` when the clones need
+their own copies of nested containers.
 '''
-from abc import ABC, abstractmethod
+import copy
+import math
+import mmap
+import os
+import pickle
+import struct
+import threading
+from abc import ABC
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import mul
+
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
+# Values that can be shared between a prototype and its deep clones as-is.
+_ATOMIC = frozenset({int, float, complex, bool, str, bytes, type(None), range, type})
+
+
+def _share_or_copy(value, memo):
+    # Like copy.deepcopy, but immutable subtrees are returned as-is and
+    # shared with the original instead of being rebuilt.
+    cls = type(value)
+    if cls in _ATOMIC:
+        return value
+    key = id(value)
+    if key in memo:
+        return memo[key]
+    if cls is list:
+        result = memo[key] = []
+        result.extend([_share_or_copy(item, memo) for item in value])
+    elif cls is dict:
+        result = memo[key] = {}
+        for k, item in value.items():
+            result[k] = _share_or_copy(item, memo)
+    elif cls is set:
+        result = memo[key] = {_share_or_copy(item, memo) for item in value}
+    elif cls is tuple or cls is frozenset:
+        items = [_share_or_copy(item, memo) for item in value]
+        if all(new is old for new, old in zip(items, value)):
+            result = value
+        else:
+            result = cls(items)
+        memo[key] = result
+    elif isinstance(value, Shape):
+        result = value._clone(memo)
+    else:
+        result = copy.deepcopy(value, memo)
+    return result
+
+
+def _clone_dict_only(self, deep=False):
+    # Shallow clone for shapes whose state is all in __dict__: no slot loop,
+    # and the copy bypasses __setattr__ just like Shape.clone().
+    if deep or tracing.enabled:
+        return Shape.clone(self, deep)
+    new = object.__new__(self.__class__)
+    new.__dict__.update(self.__dict__)
+    return new
 
 
 class Shape(ABC):
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Slot names are resolved once per class, not on every clone.
+        names = []
+        for klass in reversed(cls.__mro__):
+            slots = klass.__dict__.get('__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name in ('__dict__', '__weakref__'):
+                    continue
+                if name.startswith('__') and not name.endswith('__'):
+                    name = f'_{klass.__name__.lstrip("_")}{name}'
+                names.append(name)
+        cls._clone_slots = tuple(names)
+        cls._clone_dict = cls.__dictoffset__ != 0
+        # A clone() written by the class itself or a parent is left alone.
+        if cls.clone is Shape.clone or cls.clone is _clone_dict_only:
+            dict_only = cls._clone_dict and not cls._clone_slots
+            cls.clone = _clone_dict_only if dict_only else Shape.clone
 
-    @abstractmethod
-    def clone(self):
-        pass
+    def clone(self, deep=False):
+        """
+        Copy the object without calling __init__. The default shallow clone
+        shares nested objects with the prototype; deep=True copies mutable
+        containers while still sharing immutable values and tuples.
+        """
+        if tracing.enabled:
+            return tracing.trace('prototype', type(self).__name__, self._copy, deep)
+        return self._copy(deep)
+
+    def _copy(self, deep):
+        if deep:
+            return self._clone({})
+        new = object.__new__(self.__class__)
+        if self._clone_dict:
+            new.__dict__.update(self.__dict__)
+        for name in self._clone_slots:
+            try:
+                object.__setattr__(new, name, getattr(self, name))
+            except AttributeError:
+                pass
+        return new
+
+    def _clone(self, memo):
+        new = memo[id(self)] = object.__new__(self.__class__)
+        if self._clone_dict:
+            new.__dict__.update({name: _share_or_copy(value, memo)
+                                 for name, value in self.__dict__.items()})
+        for name in self._clone_slots:
+            try:
+                object.__setattr__(new, name, _share_or_copy(getattr(self, name), memo))
+            except AttributeError:
+                pass
+        return new
+
+
+_clone_dict_only.__doc__ = Shape.clone.__doc__
 
 
 class Circle(Shape):
+    dimensions = ('radius',)
+
     def __init__(self, radius):
         self.radius = radius
-    
-    def clone(self):
-        return self.__class__(**self.__dict__)
+
+    @staticmethod
+    def area_from(radius):
+        return math.pi * radius * radius
+
+    def area(self):
+        return self.area_from(self.radius)
 
 
 class Square(Shape):
+    dimensions = ('side',)
+
     def __init__(self, side):
         self.side = side
 
-    def clone(self):
-        return self.__class__(**self.__dict__)
-    
+    @staticmethod
+    def area_from(side):
+        return side * side
+
+    def area(self):
+        return self.area_from(self.side)
+
+
+class StaleSnapshot(Exception):
+    pass
+
+
+class _Prototypes(dict):
+    # Prototypes restored from a snapshot are unpickled on first lookup, so
+    # the clone fast path never checks whether an entry is loaded.
+    def __init__(self, load):
+        super().__init__()
+        self._load = load
+
+    def __missing__(self, name):
+        return self._load(name)
+
+
+class PrototypeRegistry:
+    """
+    Named prototypes to clone from. With pool_size > 0, each prototype keeps
+    a stock of ready-made clones that a background thread tops up, so that
+    clone() only has to pop one off.
+
+    save() writes the prototypes to a snapshot file that load() maps into
+    memory, so a new process can start cloning without rebuilding them.
+    """
+    MAGIC = b'PROT'
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct('<4sHHI')  # magic, format version, version length, entries
+    ENTRY = struct.Struct('<HQQ?')  # name length, offset, length, deep
+
+    def __init__(self, pool_size=0):
+        self.pool_size = pool_size
+        self._prototypes = _Prototypes(self._load_from_snapshot)
+        self._pools = {}
+        self._lock = threading.Lock()
+        self._refill = threading.Event()
+        self._closed = False
+        self._refiller = None
+        self._snapshot = None
+        self._snapshot_index = {}
+
+    def register(self, name, prototype, deep=False):
+        with self._lock:
+            self._prototypes[name] = (prototype, deep)
+            self._pools[name] = deque()
+        if self.pool_size:
+            self._start_refiller()
+            self._refill.set()
+
+    def unregister(self, name):
+        with self._lock:
+            if name not in self:
+                raise KeyError(name)
+            self._prototypes.pop(name, None)
+            self._snapshot_index.pop(name, None)
+            self._pools.pop(name, None)
+
+    def get(self, name):
+        return self._prototypes[name][0]
+
+    def __contains__(self, name):
+        return name in self._prototypes or name in self._snapshot_index
+
+    def names(self):
+        return sorted({*self._prototypes, *self._snapshot_index})
+
+    def save(self, path, version):
+        """Write every prototype to path, tagged with the caller's version."""
+        version = str(version).encode()
+        entries = []
+        for name in self.names():
+            prototype, deep = self._prototypes[name]
+            entries.append((name.encode(), deep, pickle.dumps(prototype, pickle.HIGHEST_PROTOCOL)))
+        offset = (self.HEADER.size + len(version)
+                  + sum(self.ENTRY.size + len(name) for name, _, _ in entries))
+        chunks = [self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, len(version), len(entries)),
+                  version]
+        for name, deep, payload in entries:
+            chunks += [self.ENTRY.pack(len(name), offset, len(payload), deep), name]
+            offset += len(payload)
+        chunks += [payload for _, _, payload in entries]
+        # Written aside and renamed, so readers never map a partial file.
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            file.writelines(chunks)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path, version, build=None, pool_size=0):
+        """
+        Map the snapshot at path. Prototypes are unpickled lazily, the first
+        time each one is used. If the snapshot is missing, corrupt, or was
+        saved with another version, build(registry) registers the prototypes
+        from scratch and a fresh snapshot is saved, unless build is None, in
+        which case StaleSnapshot is raised.
+        """
+        registry = cls(pool_size=pool_size)
+        try:
+            registry._open_snapshot(path, str(version).encode())
+        # ValueError covers empty files and undecodable names.
+        except (OSError, StaleSnapshot, struct.error, ValueError):
+            if build is None:
+                raise StaleSnapshot(f'no usable snapshot at {path} for version {version}')
+            build(registry)
+            registry.save(path, version)
+        return registry
+
+    def _open_snapshot(self, path, version):
+        with open(path, 'rb') as file:
+            snapshot = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, format_version, version_length, count = self.HEADER.unpack_from(snapshot)
+            position = self.HEADER.size
+            if (magic, format_version) != (self.MAGIC, self.FORMAT_VERSION):
+                raise StaleSnapshot(f'{path} has an unsupported format')
+            if snapshot[position:position + version_length] != version:
+                raise StaleSnapshot(f'{path} was saved for another version')
+            position += version_length
+            index = {}
+            for _ in range(count):
+                name_length, offset, length, deep = self.ENTRY.unpack_from(snapshot, position)
+                position += self.ENTRY.size
+                name = snapshot[position:position + name_length].decode()
+                position += name_length
+                index[name] = (offset, length, deep)
+        except BaseException:
+            snapshot.close()
+            raise
+        self._snapshot, self._snapshot_index = snapshot, index
+
+    def _load_from_snapshot(self, name):
+        with self._lock:
+            if name in self._prototypes:  # loaded by another thread meanwhile
+                return dict.__getitem__(self._prototypes, name)
+            offset, length, deep = self._snapshot_index[name]
+            prototype = pickle.loads(self._snapshot[offset:offset + length])
+            # Stored before the index entry goes, so that lookups and `in`
+            # from other threads always find the name in one or the other.
+            dict.__setitem__(self._prototypes, name, (prototype, deep))
+            del self._snapshot_index[name]
+            self._pools.setdefault(name, deque())
+        if self.pool_size:
+            self._start_refiller()
+            self._refill.set()
+        return prototype, deep
+
+    def clone(self, name, **overrides):
+        prototype, deep = self._prototypes[name]
+        pool = self._pools[name]
+        try:
+            new = pool.pop()
+        except IndexError:
+            new = prototype.clone(deep=deep)
+        if len(pool) < self.pool_size // 2:
+            self._refill.set()
+        for attribute, value in overrides.items():
+            setattr(new, attribute, value)
+        return new
+
+    def clone_many(self, name, n, **overrides):
+        prototype, deep = self._prototypes[name]
+        cls = type(prototype)
+        # Overrides for properties and other data descriptors must go
+        # through setattr, as in clone(); traced clones are counted one by one.
+        if (deep or tracing.enabled or cls._clone_slots or not cls._clone_dict
+                or any(hasattr(type(getattr(cls, name, None)), '__set__') for name in overrides)):
+            clones = [prototype.clone(deep=deep) for _ in range(n)]
+            for new in clones:
+                for attribute, value in overrides.items():
+                    setattr(new, attribute, value)
+            return clones
+        # Plain __dict__ shapes: merge the overrides once and stamp the same
+        # state onto every new object.
+        state = {**prototype.__dict__, **overrides}
+        new_object = object.__new__
+        clones = []
+        for _ in range(n):
+            new = new_object(cls)
+            new.__dict__.update(state)
+            clones.append(new)
+        return clones
+
+    def _start_refiller(self):
+        with self._lock:
+            if self._refiller is None:
+                self._refiller = threading.Thread(target=self._refill_pools, daemon=True)
+                self._refiller.start()
+
+    def _refill_pools(self):
+        while True:
+            self._refill.wait()
+            self._refill.clear()
+            if self._closed:
+                return
+            with self._lock:
+                pools = [(name, prototype, deep, self._pools[name])
+                         for name, (prototype, deep) in self._prototypes.items()]
+            for name, prototype, deep, pool in pools:
+                missing = self.pool_size - len(pool)
+                if missing > 0:
+                    pool.extend(prototype.clone(deep=deep) for _ in range(missing))
+
+    def close(self):
+        self._closed = True
+        self._refill.set()
+        if self._refiller is not None:
+            self._refiller.join()
+        if self._snapshot is not None:
+            self._snapshot.close()
+
+
+def _fields(shape):
+    # (name, value) for every attribute set on shape, in slots or __dict__.
+    for name in shape._clone_slots:
+        try:
+            yield name, getattr(shape, name)
+        except AttributeError:  # unset slot
+            pass
+    if shape._clone_dict:
+        yield from shape.__dict__.items()
+
+
+class ShapeBatch:
+    """
+    Many clones of one prototype stored column-wise: one array per numeric
+    attribute instead of one Python object and dict per shape. Attributes
+    that are not numbers are shared by every row.
+    """
+
+    def __init__(self, cls, columns, constants=None, n=None):
+        self.cls = cls
+        self.columns = columns
+        self.constants = constants or {}
+        # Kept separately: a prototype without numeric attributes has no columns.
+        self.n = len(next(iter(columns.values()), ())) if n is None else n
+
+    @classmethod
+    def from_prototype(cls, prototype, n):
+        columns, constants = {}, {}
+        for name, value in _fields(prototype):
+            if type(value) is int:
+                columns[name] = array('q', [value]) * n
+            elif type(value) is float:
+                columns[name] = array('d', [value]) * n
+            else:
+                constants[name] = value
+        return cls(type(prototype), columns, constants, n)
+
+    def __len__(self):
+        return self.n
+
+    def set(self, name, values):
+        # A scalar is broadcast to every row.
+        if isinstance(values, (int, float)):
+            typecode = 'q' if type(values) is int else 'd'
+            self.columns[name] = array(typecode, [values]) * self.n
+        else:
+            values = array('d', values)
+            if len(values) != self.n:
+                raise ValueError(f'expected {self.n} values, got {len(values)}')
+            self.columns[name] = values
+
+    def apply(self, func, *names):
+        return array('d', map(func, *(self.columns[name] for name in names)))
+
+    def scale(self, factor):
+        for name in self.cls.dimensions:
+            self.columns[name] = array('d', map(mul, self.columns[name], repeat(factor)))
+
+    def area(self):
+        return self.apply(self.cls.area_from, *self.cls.dimensions)
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def __getitem__(self, index):
+        # Materializes a standalone Shape; changing it does not touch the batch.
+        if not -self.n <= index < self.n:
+            raise IndexError('batch index out of range')
+        shape = object.__new__(self.cls)
+        for name, value in self.constants.items():
+            object.__setattr__(shape, name, value)
+        for name, column in self.columns.items():
+            object.__setattr__(shape, name, column[index])
+        return shape
+
+    def __iter__(self):
+        return (self[index] for index in range(self.n))
+
+
+def main():
+    '''
+    >>> circle = Circle(radius=5).clone()
+    >>> type(circle).__name__, circle.radius
+    ('Circle', 5)
+    >>> circle.label = 'wheel'
+    >>> vars(circle.clone())
+    {'radius': 5, 'label': 'wheel'}
+
+    # Each clone copies exactly its own attributes, never class attributes
+    >>> class Tagged(Shape):
+    ...     color = 'red'
+    ...     def __init__(self, radius, **extra):
+    ...         self.radius = radius
+    ...         self.__dict__.update(extra)
+    >>> vars(Tagged(1, color='blue').clone()), vars(Tagged(2, tag='important').clone())
+    ({'radius': 1, 'color': 'blue'}, {'radius': 2, 'tag': 'important'})
+
+    # Clones are filled in without going through __setattr__, so frozen shapes can be cloned
+    >>> class FrozenPoint(Shape):
+    ...     __slots__ = ('x', 'y')
+    ...     def __init__(self, x, y):
+    ...         object.__setattr__(self, 'x', x)
+    ...         object.__setattr__(self, 'y', y)
+    ...     def __setattr__(self, name, value):
+    ...         raise AttributeError(f'{type(self).__name__} is frozen')
+    >>> class FrozenLabel(Shape):
+    ...     def __init__(self, text):
+    ...         self.__dict__['text'] = text
+    ...     def __setattr__(self, name, value):
+    ...         raise AttributeError(f'{type(self).__name__} is frozen')
+    >>> point = FrozenPoint(1, 2).clone()
+    >>> (point.x, point.y), FrozenLabel('north').clone().text
+    ((1, 2), 'north')
+    >>> FrozenPoint(1, 2).clone(deep=True).y
+    2
+
+    # Cloning does not call __init__, so slots and extra attributes are fine
+    >>> class Polygon(Shape):
+    ...     __slots__ = ('points', 'style', '__cache')
+    ...     def __init__(self, points, style):
+    ...         self.points = points
+    ...         self.style = style
+    >>> template = Polygon([(0, 0), (1, 0), (0, 1)], style=('red', {'width': 2}))
+    >>> shallow = template.clone()
+    >>> shallow.points is template.points, shallow.style is template.style
+    (True, True)
+    >>> hasattr(shallow, '_Polygon__cache')
+    False
+
+    # Deep clones copy mutable containers but share immutable parts
+    >>> deep = template.clone(deep=True)
+    >>> deep.points == template.points, deep.points is template.points
+    (True, False)
+    >>> deep.points[0] is template.points[0]
+    True
+    >>> deep.style is template.style, deep.style[1] is template.style[1]
+    (False, False)
+    >>> deep.style[1]['width'] = 3
+    >>> template.style
+    ('red', {'width': 2})
+
+    # A registry of named prototypes, cloned in bulk with overrides
+    >>> registry = PrototypeRegistry()
+    >>> registry.register('circle', Circle(radius=5))
+    >>> registry.register('polygon', template, deep=True)
+    >>> circles = registry.clone_many('circle', 1000, radius=7)
+    >>> len(circles), {circle.radius for circle in circles}, len(set(map(id, circles)))
+    (1000, {7}, 1000)
+    >>> registry.get('circle').radius
+    5
+    >>> polygons = registry.clone_many('polygon', 2, style=('blue', {}))
+    >>> polygons[0].points is polygons[1].points, polygons[0].style
+    (False, ('blue', {}))
+
+    # With tracing enabled, every clone made in bulk is recorded
+    >>> sink = tracing.enable()
+    >>> _ = registry.clone_many('circle', 50, radius=3)
+    >>> tracing.disable()
+    >>> [(row['kind'], row['name'], row['count']) for row in sink.report()]
+    [('prototype', 'Circle', 50)]
+
+    # With a pool, clones are made ahead of time in the background
+    >>> import time
+    >>> pooled = PrototypeRegistry(pool_size=64)
+    >>> pooled.register('square', Square(side=10))
+    >>> for _ in range(100):
+    ...     if len(pooled._pools['square']) == 64:
+    ...         break
+    ...     time.sleep(0.01)
+    >>> square = pooled.clone('square', side=3)
+    >>> square.side, len(pooled._pools['square']), pooled.get('square').side
+    (3, 63, 10)
+    >>> pooled.close()
+
+    # Snapshots let a new process map its prototypes instead of rebuilding them
+    >>> import tempfile
+    >>> directory = tempfile.TemporaryDirectory()
+    >>> path = os.path.join(directory.name, 'prototypes.snapshot')
+    >>> def build(registry):
+    ...     print('building prototypes')
+    ...     registry.register('circle', Circle(radius=5))
+    ...     registry.register('square', Square(side=10), deep=True)
+    >>> PrototypeRegistry.load(path, version='v1', build=build).names()
+    building prototypes
+    ['circle', 'square']
+    >>> warm = PrototypeRegistry.load(path, version='v1', build=build)
+    >>> list(warm._prototypes), 'square' in warm
+    ([], True)
+    >>> warm.clone('circle', radius=6).radius, list(warm._prototypes)
+    (6, ['circle'])
+    >>> warm.clone_many('square', 2)[1].side
+    10
+
+    # Overrides go through properties in bulk clones too
+    >>> class Ring(Shape):
+    ...     def __init__(self, radius):
+    ...         self._radius = radius
+    ...     @property
+    ...     def r(self):
+    ...         return self._radius
+    ...     @r.setter
+    ...     def r(self, value):
+    ...         self._radius = value
+    >>> rings = PrototypeRegistry()
+    >>> rings.register('ring', Ring(1))
+    >>> rings.clone('ring', r=7).r, rings.clone_many('ring', 2, r=7)[0].r
+    (7, 7)
+    >>> warm.close()
+    >>> PrototypeRegistry.load(path, version='v2', build=build).get('square').side
+    building prototypes
+    10
+    >>> PrototypeRegistry.load(path, version='v3')  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    StaleSnapshot: no usable snapshot at ... for version v3
+
+    # Concurrent first lookups load each prototype once
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> warm = PrototypeRegistry.load(path, version='v2')
+    >>> with ThreadPoolExecutor(8) as executor:
+    ...     radii = list(executor.map(lambda _: warm.clone('circle').radius, range(8)))
+    >>> radii
+    [5, 5, 5, 5, 5, 5, 5, 5]
+    >>> warm.close()
+
+    # Empty or damaged snapshot files are rebuilt
+    >>> bad_name = (PrototypeRegistry.HEADER.pack(b'PROT', 1, 2, 1) + b'v2'
+    ...             + PrototypeRegistry.ENTRY.pack(1, 0, 0, False) + bytes([255]))
+    >>> for damage in (b'', b'PROT', bad_name):
+    ...     with open(path, 'wb') as file:
+    ...         _ = file.write(damage)
+    ...     PrototypeRegistry.load(path, version='v2', build=build).get('circle').radius
+    building prototypes
+    5
+    building prototypes
+    5
+    building prototypes
+    5
+    >>> directory.cleanup()
+
+    # Millions of clones can be kept column-wise and processed in bulk
+    >>> batch = ShapeBatch.from_prototype(Circle(radius=2), 1_000_000)
+    >>> len(batch), batch.nbytes()
+    (1000000, 8000000)
+    >>> batch.scale(1.5)
+    >>> batch.set('radius', range(1_000_000))
+    >>> area = batch.area()
+    >>> round(area[10], 3) == round(Circle(radius=10).area(), 3)
+    True
+    >>> circle = batch[3]
+    >>> type(circle).__name__, circle.radius, circle.area() == area[3]
+    ('Circle', 3.0, True)
+    >>> squares = ShapeBatch.from_prototype(Square(side=3), 4)
+    >>> squares.scale(2)
+    >>> squares.scale(1)
+    >>> list(squares.area()), [square.side for square in squares]
+    ([36.0, 36.0, 36.0, 36.0], [6.0, 6.0, 6.0, 6.0])
+
+    # The batch keeps its size even when the prototype has no numeric attributes
+    >>> class Label(Shape):
+    ...     def __init__(self, text):
+    ...         self.text = text
+    >>> labels = ShapeBatch.from_prototype(Label('north'), 3)
+    >>> len(labels), [label.text for label in labels]
+    (3, ['north', 'north', 'north'])
+    >>> labels.set('size', 12)
+    >>> list(labels.columns['size']), labels[2].size
+    ([12, 12, 12], 12)
+    >>> labels[3]
+    Traceback (most recent call last):
+    ...
+    IndexError: batch index out of range
+
+    # Slotted shapes can be batched too
+    >>> points = ShapeBatch.from_prototype(FrozenPoint(1, 2.5), 3)
+    >>> points.set('x', [10, 20, 30])
+    >>> point = points[1]
+    >>> type(point).__name__, point.x, point.y, hasattr(point, '__dict__')
+    ('FrozenPoint', 20.0, 2.5, False)
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()
+
 
-circle_prototype = Circle(radius=5)
-Square_prototype = Square(side=10)
+if __name__ == '__main__':
+    circle_prototype = Circle(radius=5)
+    Square_prototype = Square(side=10)
 
-circle1 = circle_prototype.clone()
-square1 = Square_prototype.clone()
+    circle1 = circle_prototype.clone()
+    square1 = Square_prototype.clone()
 
-print(circle1.radius)
-print(square1.side)
\ No newline at end of file
+    print(circle1.radius)
+    print(square1.side)
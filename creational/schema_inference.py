@@ -0,0 +1,315 @@
+'''
+Schema inference on top of the Builder pattern: `SchemaInferenceBuilder` drives a `TableBuilder`
+from data instead of hand-written code. It streams a large CSV or JSON-lines file, infers each
+column's type and picks a primary key, without loading the file in memory.
+
+- The file can be sampled or fully scanned, and split into byte ranges that are scanned in
+  parallel in a process pool and then merged.
+- Primary-key candidates are checked with a bounded-memory `UniquenessSketch`, which estimates
+  the number of distinct values from the smallest hashes it has seen.
+
+It lives apart from `builder.py` so that importing the builder does not pay for the csv, json and
+hashing modules that only inference needs.
+'''
+import csv
+import hashlib
+import heapq
+import json
+import os
+import re
+from datetime import datetime
+
+try:
+    from .builder import TableBuilder
+except ImportError:  # run as a script
+    from builder import TableBuilder
+
+
+# Types that can be inferred, from the most to the least specific. Two
+# different types merge into the most general type that can hold both.
+_NUMERIC = ('int', 'float')
+_TEMPORAL = ('date', 'datetime')
+_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def _merge_types(a, b):
+    if a == b or b is None:
+        return a
+    if a is None:
+        return b
+    for family in (_NUMERIC, _TEMPORAL):
+        if a in family and b in family:
+            return family[max(family.index(a), family.index(b))]
+    return 'string'
+
+
+def _text_type(value):
+    if value.lower() in ('true', 'false'):
+        return 'bool'
+    for parse, data_type in ((int, 'int'), (float, 'float')):
+        try:
+            parse(value)
+            return data_type
+        except ValueError:
+            pass
+    if _DATE.fullmatch(value):
+        return 'date'
+    try:
+        datetime.fromisoformat(value)
+        return 'datetime'
+    except ValueError:
+        return 'string'
+
+
+def _json_type(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    return 'string'
+
+
+class UniquenessSketch:
+    """
+    Bounded-memory uniqueness check: a k-minimum-values sketch keeps the k
+    smallest 64-bit value hashes. It estimates the number of distinct values,
+    and a repeated hash among the kept ones proves a duplicate. Up to k rows
+    the check is exact.
+    """
+    __slots__ = ('size', 'hashes', '_heap', 'duplicate')
+
+    def __init__(self, size=1024):
+        self.size = size
+        self.hashes = set()
+        self._heap = []  # negated hashes, so the largest kept hash is on top
+        self.duplicate = False
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        self._add_hash(int.from_bytes(digest, 'little'))
+
+    def _add_hash(self, value_hash):
+        if value_hash in self.hashes:
+            self.duplicate = True
+        elif len(self._heap) < self.size:
+            self.hashes.add(value_hash)
+            heapq.heappush(self._heap, -value_hash)
+        elif value_hash < -self._heap[0]:
+            self.hashes.remove(-heapq.heapreplace(self._heap, -value_hash))
+            self.hashes.add(value_hash)
+
+    def merge(self, other):
+        self.duplicate |= other.duplicate
+        for value_hash in other.hashes:
+            self._add_hash(value_hash)
+        return self
+
+    def distinct(self):
+        if len(self._heap) < self.size:
+            return len(self._heap)
+        return int((self.size - 1) * 2 ** 64 / -self._heap[0])
+
+
+class ColumnStats:
+    __slots__ = ('data_type', 'values', 'sketch')
+
+    def __init__(self, sketch_size):
+        self.data_type = None
+        self.values = 0
+        self.sketch = UniquenessSketch(sketch_size)
+
+    def merge(self, other):
+        self.data_type = _merge_types(self.data_type, other.data_type)
+        self.values += other.values
+        self.sketch.merge(other.sketch)
+        return self
+
+
+def _records(lines, format, header, delimiter):
+    if format == 'csv':
+        for row in csv.reader(lines, delimiter=delimiter):
+            yield {name: value for name, value in zip(header, row) if value != ''}, _text_type
+    else:
+        for line in lines:
+            if line.strip():
+                record = json.loads(line)
+                yield {name: value for name, value in record.items() if value is not None}, _json_type
+
+
+def _infer_range(path, format, start, end, header, delimiter, max_rows, sketch_size):
+    # Scans the records whose line starts in [start, end) and returns
+    # (rows, {column: ColumnStats}). Runs in worker processes.
+    columns = {name: ColumnStats(sketch_size) for name in header}
+    rows = 0
+    with open(path, 'rb') as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()
+
+        def lines():
+            while file.tell() < end:
+                line = file.readline()
+                if not line:
+                    return
+                yield line.decode()
+
+        for record, classify in _records(lines(), format, header, delimiter):
+            if max_rows is not None and rows >= max_rows:
+                break
+            rows += 1
+            for name, value in record.items():
+                stats = columns.get(name)
+                if stats is None:
+                    stats = columns[name] = ColumnStats(sketch_size)
+                stats.values += 1
+                stats.sketch.add(value)
+                if stats.data_type != 'string':
+                    stats.data_type = _merge_types(stats.data_type, classify(value))
+    return rows, columns
+
+
+class SchemaInferenceBuilder:
+    """
+    Builds a Table from a large CSV or JSON-lines file by streaming it and
+    inferring column names and types, without loading the file in memory.
+
+    With workers > 1 the file is split in byte ranges scanned in a process
+    pool and the per-range results are merged; this assumes one record per
+    line (no quoted newlines inside CSV fields). sample_rows limits the scan
+    to that many rows, spread over the ranges. The first column that has no
+    missing values and no duplicates becomes the primary key.
+    """
+    PRIMARY_KEY_TYPES = ('int', 'string', 'date', 'datetime')
+
+    def __init__(self, path, name=None, format=None, sample_rows=None, workers=1,
+                 chunk_size=64 * 2 ** 20, sketch_size=1024, delimiter=','):
+        if format is None:
+            extension = os.path.splitext(path)[1].lower()
+            format = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}.get(extension)
+        if format not in ('csv', 'jsonl'):
+            raise ValueError(f'cannot infer a schema from {path!r}, use format="csv" or "jsonl"')
+        self.path = path
+        self.name = name or os.path.splitext(os.path.basename(path))[0]
+        self.format = format
+        self.sample_rows = sample_rows
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.sketch_size = sketch_size
+        self.delimiter = delimiter
+
+    def _header(self):
+        if self.format != 'csv':
+            return 0, []
+        with open(self.path, 'rb') as file:
+            line = file.readline()
+        return len(line), next(csv.reader([line.decode()], delimiter=self.delimiter))
+
+    def infer(self):
+        start, header = self._header()
+        size = os.path.getsize(self.path)
+        if self.workers > 1:
+            ranges = [(offset, min(offset + self.chunk_size, size))
+                      for offset in range(start, size, self.chunk_size)] or [(start, size)]
+        else:
+            # One range: quoted newlines cannot be cut at a range boundary.
+            ranges = [(start, size)]
+        max_rows = self.sample_rows
+        if max_rows is not None:
+            max_rows = -(-max_rows // len(ranges))
+        jobs = [(self.path, self.format, begin, end, header, self.delimiter, max_rows,
+                 self.sketch_size) for begin, end in ranges]
+        if self.workers > 1 and len(jobs) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(self.workers) as executor:
+                results = list(executor.map(_infer_range, *zip(*jobs)))
+        else:
+            results = [_infer_range(*job) for job in jobs]
+        rows, columns = 0, {}
+        for chunk_rows, chunk_columns in results:
+            rows += chunk_rows
+            for name, stats in chunk_columns.items():
+                if name in columns:
+                    columns[name].merge(stats)
+                else:
+                    columns[name] = stats
+        return rows, columns
+
+    def primary_key_candidates(self, rows, columns):
+        return [
+            name for name, stats in columns.items()
+            if rows and stats.values == rows and not stats.sketch.duplicate
+            and stats.data_type in self.PRIMARY_KEY_TYPES
+            and stats.sketch.distinct() >= 0.95 * rows
+        ]
+
+    def build(self):
+        rows, columns = self.infer()
+        builder = TableBuilder(self.name)
+        for name, stats in columns.items():
+            builder.add_column(name, stats.data_type or 'string')
+        candidates = self.primary_key_candidates(rows, columns)
+        if candidates:
+            builder.add_primary_key(candidates[0])
+        return builder.get_table()
+
+
+def main():
+    '''
+    # Schemas can be inferred by streaming large CSV or JSON-lines exports
+    >>> import tempfile
+    >>> directory = tempfile.TemporaryDirectory()
+    >>> orders_csv = os.path.join(directory.name, 'orders.csv')
+    >>> with open(orders_csv, 'w') as file:
+    ...     _ = file.write('order_id,customer,total,paid,created\\n')
+    ...     for n in range(3000):
+    ...         _ = file.write(f'{n},c{n % 7},{n * 1.5},{n % 2 == 0},2024-01-{n % 28 + 1:02}\\n')
+    >>> print(SchemaInferenceBuilder(orders_csv).build())
+    Table: orders
+    - order_id (int)
+    - customer (string)
+    - total (float)
+    - paid (bool)
+    - created (date)
+    Primary Key: order_id
+    >>> parallel = SchemaInferenceBuilder(orders_csv, workers=2, chunk_size=8192).build()
+    >>> str(parallel) == str(SchemaInferenceBuilder(orders_csv).build())
+    True
+    >>> notes_csv = os.path.join(directory.name, 'notes.csv')
+    >>> with open(notes_csv, 'w') as file:
+    ...     _ = file.write('id,note\\n')
+    ...     for n in range(40):
+    ...         _ = file.write(f'{n},"line one\\nline two"\\n')
+    >>> print(SchemaInferenceBuilder(notes_csv, chunk_size=256).build())
+    Table: notes
+    - id (int)
+    - note (string)
+    Primary Key: id
+    >>> events_jsonl = os.path.join(directory.name, 'events.jsonl')
+    >>> with open(events_jsonl, 'w') as file:
+    ...     for n in range(100):
+    ...         _ = file.write(json.dumps({'kind': 'click', 'id': f'e{n}', 'value': n or None}) + '\\n')
+    >>> print(SchemaInferenceBuilder(events_jsonl, sample_rows=50).build())
+    Table: events
+    - kind (string)
+    - id (string)
+    - value (int)
+    Primary Key: id
+    >>> directory.cleanup()
+
+    # The uniqueness sketch stays bounded but still estimates large counts
+    >>> sketch = UniquenessSketch(size=256)
+    >>> for n in range(100000):
+    ...     sketch.add(n)
+    >>> len(sketch.hashes), 80000 < sketch.distinct() < 120000, sketch.duplicate
+    (256, True, False)
+    >>> small = UniquenessSketch(size=256)
+    >>> for value in ['a', 'b', 'c', 'b']:
+    ...     small.add(value)
+    >>> small.distinct(), small.duplicate
+    (3, True)
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()
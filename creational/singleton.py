@@ -7,7 +7,14 @@ Here's an explanation of the components and their roles in the example:
 1. **`Singleton` Class**:
    - This class is designed to enforce the Singleton pattern.
    - It overrides the `__call__` method to control the instantiation process.
-   - The `_instance` class variable keeps track of the single instance of the class.
+   - The `_instances` registry maps each class to its single instance, so subclasses do not share
+    or shadow their parent's instance.
+   - The first call takes a per-class lock (double-checked locking), so concurrent first calls
+    construct the instance only once, while later calls are a single dictionary lookup.
+   - The registry is cleared in forked child processes, which therefore build their own instances
+    instead of reusing the parent's resources.
+   - `LazySingleton` is a proxy that can be created at import time and only constructs the instance
+    on first attribute access.
 
 2. **Usage**:
    - Two instances of the `Singleton` class (`singleton1` and `singleton2`) are created.
@@ -20,23 +27,176 @@ If not, it creates the instance; otherwise, it returns the existing instance.
 The Singleton pattern is useful in scenarios where you want to control access to a single instance of a class, such as managing
 global resources, configurations, or shared objects that should have a single point of access throughout your application.
 '''
+import os
+import threading
 from typing import Any
 
+try:
+    from . import tracing
+except ImportError:  # run as a script
+    import tracing
+
 
 class Singleton(type):
-    _instance = None
+    # One instance per class, keyed by the class itself, so subclasses of a
+    # singleton get their own instance instead of sharing the parent's.
+    _instances = {}
+    _locks = {}
+    _registry_lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs) -> Any:
+        try:
+            return Singleton._instances[cls]
+        except KeyError:
+            pass
+        with Singleton._registry_lock:
+            lock = Singleton._locks.setdefault(cls, threading.Lock())
+        # Double-checked: only the first callers take the per-class lock, and
+        # a slow constructor does not hold up other singleton classes.
+        with lock:
+            if cls not in Singleton._instances:
+                if tracing.enabled:
+                    instance = tracing.trace('singleton', cls.__name__, super().__call__,
+                                             *args, **kwargs)
+                else:
+                    instance = super().__call__(*args, **kwargs)
+                Singleton._instances[cls] = instance
+            return Singleton._instances[cls]
+
+    def reset(cls):
+        """Drop this class's instance; the next call constructs a new one."""
+        with Singleton._registry_lock:
+            Singleton._instances.pop(cls, None)
+
+    @staticmethod
+    def reset_all():
+        with Singleton._registry_lock:
+            Singleton._instances.clear()
+
+    @staticmethod
+    def _reset_after_fork():
+        # The child must not reuse the parent's connections or other
+        # resources, and any lock held by a parent thread at fork time would
+        # never be released in the child.
+        Singleton._instances = {}
+        Singleton._locks = {}
+        Singleton._registry_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=Singleton._reset_after_fork)
+
+
+class LazySingleton:
+    """
+    Stands in for a Singleton class's instance and only constructs it on
+    first attribute access, so it can be created at import time for free.
+    """
+    __slots__ = ('_cls', '_args', '_kwargs')
+
+    def __init__(self, cls, *args, **kwargs):
+        if not isinstance(cls, Singleton):
+            raise TypeError(f'{cls.__name__} does not use the Singleton metaclass')
+        object.__setattr__(self, '_cls', cls)
+        object.__setattr__(self, '_args', args)
+        object.__setattr__(self, '_kwargs', kwargs)
+
+    def _resolve(self):
+        # Not cached here: going through the metaclass keeps the proxy
+        # thread-safe and fork-safe, and costs one dict lookup once built.
+        return self._cls(*self._args, **self._kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._resolve(), name)
+
+    def __repr__(self):
+        if self._cls in Singleton._instances:
+            return f'<LazySingleton for {self._resolve()!r}>'
+        return f'<LazySingleton for {self._cls.__name__} (not created yet)>'
 
-    def __call__(self, *args, **kwargs) -> Any:
-        if self._instance is None:
-            self._instance = super().__call__(*args, **kwargs)
-        return self._instance
-    
 
 class Somethings(metaclass=Singleton):
     pass
 
 
-singleton1 = Somethings()
-singleton2 = Somethings()
+def main():
+    '''
+    >>> Somethings() is Somethings()
+    True
+
+    # Subclasses get their own instance
+    >>> class OtherThings(Somethings):
+    ...     pass
+    >>> OtherThings() is Somethings(), OtherThings() is OtherThings()
+    (False, True)
+
+    # Concurrent first calls construct the instance exactly once
+    >>> import time
+    >>> constructed = []
+    >>> class ConnectionManager(metaclass=Singleton):
+    ...     def __init__(self):
+    ...         time.sleep(0.01)
+    ...         constructed.append(self)
+    >>> barrier = threading.Barrier(50)
+    >>> instances = []
+    >>> def connect():
+    ...     barrier.wait()
+    ...     instances.append(ConnectionManager())
+    >>> threads = [threading.Thread(target=connect) for _ in range(50)]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> len(constructed), len(set(map(id, instances)))
+    (1, 1)
+
+    # A forked child starts with an empty registry
+    >>> import multiprocessing
+    >>> def child(conn):
+    ...     conn.send(ConnectionManager in Singleton._instances)
+    >>> parent_conn, child_conn = multiprocessing.Pipe()
+    >>> process = multiprocessing.get_context('fork').Process(target=child, args=(child_conn,))
+    >>> process.start(); process.join()
+    >>> parent_conn.recv(), ConnectionManager in Singleton._instances
+    (False, True)
+
+    >>> somethings = Somethings()
+    >>> ConnectionManager.reset()
+    >>> ConnectionManager() is instances[0], len(constructed), Somethings() is somethings
+    (False, 2, True)
+    >>> Singleton.reset_all()
+    >>> Somethings() is somethings
+    False
+
+    # A lazy proxy defers construction until it is first used
+    >>> class Settings(metaclass=Singleton):
+    ...     def __init__(self, debug):
+    ...         constructed.append(self)
+    ...         self.debug = debug
+    >>> settings = LazySingleton(Settings, debug=True)
+    >>> settings
+    <LazySingleton for Settings (not created yet)>
+    >>> len(constructed)
+    2
+    >>> settings.debug, len(constructed), constructed[-1] is Settings()
+    (True, 3, True)
+    >>> settings.debug = False
+    >>> Settings().debug
+    False
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()
+
+
+if __name__ == '__main__':
+    singleton1 = Somethings()
+    singleton2 = Somethings()
 
-print(singleton1 is singleton2)
\ No newline at end of file
+    print(singleton1 is singleton2)
@@ -0,0 +1,208 @@
+'''
+Opt-in tracing of object creation across the creational patterns: how many objects each factory,
+builder, pool, prototype and singleton creates, how long each creation takes, and, when memory
+sampling is on, roughly how many bytes it allocates (measured with `tracemalloc`).
+
+The hooks stay in production code at no real cost while tracing is disabled:
+
+- `get_deployment_service()`, `TableBuilder`, `Shape.clone()`, `Singleton.__call__` (only when it
+  actually constructs the instance) and `WorkerPool.get_worker()` check the module-level `enabled`
+  flag once per call.
+- `order_food()`/`order_drink()` of `ResturantFactory` subclasses are only wrapped while tracing is
+  enabled, and restored by `disable()`.
+
+Every traced creation is sent to a sink as a `CreationEvent`. Any callable can be a sink; the
+default `AggregatingSink` keeps per-class totals and produces reports.
+'''
+import random
+import threading
+import time
+from collections import namedtuple
+
+CreationEvent = namedtuple('CreationEvent', ['kind', 'name', 'elapsed', 'allocated'])
+
+enabled = False
+_sink = None
+_memory_sample_rate = 0.0
+_started_tracemalloc = False
+_instrumented = []  # (cls, method names, kind)
+_originals = {}  # (cls, method name) -> original function, while enabled
+
+
+class AggregatingSink:
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = (event.kind, event.name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {'count': 0, 'total_time': 0.0, 'max_time': 0.0,
+                                            'sampled': 0, 'sampled_bytes': 0}
+            stats['count'] += 1
+            stats['total_time'] += event.elapsed
+            stats['max_time'] = max(stats['max_time'], event.elapsed)
+            if event.allocated is not None:
+                stats['sampled'] += 1
+                stats['sampled_bytes'] += event.allocated
+
+    def report(self):
+        # Most frequently created classes first; bytes are extrapolated from
+        # the sampled creations.
+        with self._lock:
+            items = [(key, dict(stats)) for key, stats in self._stats.items()]
+        report = []
+        for (kind, name), stats in sorted(items, key=lambda item: -item[1]['count']):
+            sampled = stats.pop('sampled')
+            sampled_bytes = stats.pop('sampled_bytes')
+            stats['mean_time'] = stats['total_time'] / stats['count']
+            stats['allocated_bytes'] = (sampled_bytes * stats['count'] // sampled
+                                        if sampled else None)
+            report.append({'kind': kind, 'name': name, **stats})
+        return report
+
+    def format_report(self):
+        lines = [f"{'kind':<16} {'name':<32} {'count':>9} {'mean us':>9} {'max us':>9} {'bytes':>11}"]
+        for row in self.report():
+            allocated = '-' if row['allocated_bytes'] is None else row['allocated_bytes']
+            lines.append(f"{row['kind']:<16} {row['name']:<32} {row['count']:>9} "
+                         f"{row['mean_time'] * 1e6:>9.2f} {row['max_time'] * 1e6:>9.2f} "
+                         f"{allocated:>11}")
+        return '\n'.join(lines)
+
+
+def trace(kind, name, create, *args, **kwargs):
+    sample = _memory_sample_rate and random.random() < _memory_sample_rate
+    if sample:
+        import tracemalloc
+        before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        return create(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0] - before if sample else None
+        sink = _sink
+        if sink is not None:
+            sink(CreationEvent(kind, name, elapsed, allocated))
+
+
+def _wrap(cls, method_name, kind):
+    original = cls.__dict__[method_name]
+    label = f'{cls.__name__}.{method_name}'
+
+    def traced(*args, **kwargs):
+        return trace(kind, label, original, *args, **kwargs)
+    traced.__wrapped__ = original
+    _originals[cls, method_name] = original
+    setattr(cls, method_name, traced)
+
+
+def instrument(cls, method_names, kind):
+    """Trace the methods that cls itself defines whenever tracing is enabled."""
+    method_names = [name for name in method_names if name in cls.__dict__]
+    _instrumented.append((cls, method_names, kind))
+    if enabled:
+        for name in method_names:
+            _wrap(cls, name, kind)
+
+
+def enable(sink=None, memory_sample_rate=0.0):
+    """
+    Start tracing and return the sink. memory_sample_rate is the fraction of
+    creations whose allocations are measured; any non-zero rate starts
+    tracemalloc, which slows the whole process down while it runs.
+    """
+    global enabled, _sink, _memory_sample_rate, _started_tracemalloc
+    if enabled:
+        disable()
+    _sink = sink if sink is not None else AggregatingSink()
+    _memory_sample_rate = memory_sample_rate
+    if memory_sample_rate:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracemalloc = True
+    for cls, method_names, kind in _instrumented:
+        for name in method_names:
+            _wrap(cls, name, kind)
+    enabled = True
+    return _sink
+
+
+def disable():
+    global enabled, _sink, _memory_sample_rate, _started_tracemalloc
+    enabled = False
+    for (cls, method_name), original in _originals.items():
+        setattr(cls, method_name, original)
+    _originals.clear()
+    if _started_tracemalloc:  # left running if the caller started it
+        import tracemalloc
+        tracemalloc.stop()
+        _started_tracemalloc = False
+    _sink, _memory_sample_rate = None, 0.0
+
+
+def main():
+    '''
+    >>> from creational.abstract_factory import PizzaFactory, place_order
+    >>> from creational.builder import TableBuilder
+    >>> from creational.factory import (CloudDeployment, get_deployment_service,
+    ...                                 register_deployment_service)
+    >>> from creational.pool_object import WorkerPool
+    >>> from creational.prototype import Circle
+    >>> from creational.singleton import Singleton
+    >>> _ = register_deployment_service('shared-cloud', CloudDeployment, policy='shared')
+    >>> original_order_food = PizzaFactory.order_food
+
+    >>> sink = enable(memory_sample_rate=1.0)
+    >>> circles = [Circle(radius=5).clone() for _ in range(100)]
+    >>> _ = get_deployment_service('cloud')
+    >>> _ = [get_deployment_service('shared-cloud') for _ in range(100)]
+    >>> place_order(PizzaFactory())
+    your pizza will be prepared soon
+    your soda will be served soon
+    >>> builder = TableBuilder('user')
+    >>> builder.add_column('id', 'int')
+    >>> pool = WorkerPool(max_workers=2)
+    >>> with pool.lease():
+    ...     pass
+    >>> class Config(metaclass=Singleton):
+    ...     pass
+    >>> Config() is Config()
+    True
+    >>> disable()
+
+    >>> for row in sink.report():
+    ...     print(row['kind'], row['name'], row['count'], row['allocated_bytes'] is not None)
+    prototype Circle 100 True
+    factory cloud 1 True
+    factory shared-cloud 1 True
+    abstract_factory PizzaFactory.order_food 1 True
+    abstract_factory PizzaFactory.order_drink 1 True
+    builder Table 1 True
+    builder Column 1 True
+    pool Worker 1 True
+    singleton Config 1 True
+    >>> print(sink.format_report().splitlines()[0])
+    kind             name                                 count   mean us    max us       bytes
+
+    # Disabled again: nothing is recorded and the factories are unwrapped
+    >>> _ = Circle(radius=1).clone()
+    >>> sink.report()[0]['count'], PizzaFactory.order_food is original_order_food
+    (100, True)
+
+    # tracemalloc started by the caller keeps running after disable()
+    >>> import tracemalloc
+    >>> tracemalloc.start()
+    >>> _ = enable(memory_sample_rate=0.5)
+    >>> disable()
+    >>> tracemalloc.is_tracing()
+    True
+    >>> tracemalloc.stop()
+    '''
+    if __name__ == "__main__":
+        import doctest
+        doctest.testmod()